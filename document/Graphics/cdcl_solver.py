@@ -0,0 +1,485 @@
+from array import array
+
+from clause_arena import HEADER_SIZE, ClauseArena
+from clause_database import ClauseDatabase
+from decision_heuristics import NaiveHeuristic
+from dimacs import DimacsFormula
+from phases import PhaseManager
+from propagation import TwoWatchedLiterals
+from restart_policy import RestartPolicy
+from solver_state import SolverState, to_code, to_literal
+
+
+class CDCLSolver:
+    """
+    Conflict-driven clause learning solver built from pluggable components:
+      - propagator: the propagation engine (TwoWatchedLiterals, see propagation.py);
+      - heuristic: the decision heuristic (NaiveHeuristic, VSIDSHeuristic or DLISHeuristic,
+        see decision_heuristics.py);
+      - phases: the polarity of the decisions (PhaseManager, see phases.py);
+      - restart_policy: when to restart (see restart_policy.py);
+      - clause_db: how learned clauses are kept and deleted (see clause_database.py);
+      - preprocessor: optional simplification of the formula before search (see preprocessing.py).
+    The solver variants in the dpll_cdcl_*_solver.py files are compositions of this core.
+
+    The solver is incremental: between two calls to solve(), clauses can be added with
+    add_clause(), and solve() accepts assumptions, literals that hold for that call only. The
+    learned clauses, activities, phases and watches are kept from one call to the next.
+    """
+
+    __slots__ = ('arena', 'clauses', 'learnts', 'variables', 'known', 'state', 'seen', 'simplified_trail_size',
+                 'failed', 'propagator', 'heuristic', 'phases', 'restart_policy', 'clause_db', 'preprocessor')
+
+    # Fraction of the arena that may be taken by deleted clauses before it is compacted.
+    GARBAGE_FRACTION = 0.2
+
+    def __init__(self, formula, heuristic=None, restart_policy=None, clause_db=None, propagator=None, phases=None,
+                 preprocessor=None):
+        """
+        Initializes the SAT solver.
+
+        Parameters:
+          formula: A list of clauses, where each clause is represented as a list of integers.
+                   A positive integer i represents the variable x_i, and a negative integer -i represents ¬x_i.
+                   It can also be a DimacsFormula read by dimacs.load_dimacs(), whose arena the
+                   solver then uses as it is.
+          heuristic: DecisionHeuristic choosing the decisions (NaiveHeuristic if None).
+          restart_policy: RestartPolicy deciding when to restart (no restarts if None).
+          clause_db: ClauseDatabase managing the learned clauses (a default one if None).
+          propagator: Propagation engine (TwoWatchedLiterals if None).
+          phases: PhaseManager choosing the polarity of decisions (a default one if None).
+          preprocessor: Preprocessor simplifying the formula before search (none if None).
+        """
+        self.heuristic = heuristic if heuristic is not None else NaiveHeuristic()
+        self.restart_policy = restart_policy if restart_policy is not None else RestartPolicy()
+        self.clause_db = clause_db if clause_db is not None else ClauseDatabase()
+        self.propagator = propagator if propagator is not None else TwoWatchedLiterals()
+        self.phases = phases if phases is not None else PhaseManager()
+        self.preprocessor = preprocessor
+        if preprocessor is not None:
+            simplified = preprocessor.run(formula)
+            formula = [[]] if simplified is None else simplified  # An empty clause if UNSAT.
+        if isinstance(formula, DimacsFormula):
+            self.arena = formula.arena
+            self.clauses = list(formula.clauses)
+            self.variables = list(formula.variables)
+        else:
+            # Clauses live in a ClauseArena (see clause_arena.py) as literal codes (see solver_state.py)
+            # and are referred to by their reference (cref). Repeated literals are dropped.
+            self.arena = ClauseArena()
+            self.clauses = [self.arena.add(dict.fromkeys(to_code(literal) for literal in clause))
+                            for clause in formula]
+            self.variables = sorted({code >> 1 for cref in self.clauses for code in self.arena.literals(cref)})
+        self.learnts = []  # References of the learned clauses.
+        num_vars = self.variables[-1] if self.variables else 0
+        # Variable -> 1 if it is in self.variables.
+        self.known = array('b', bytes(num_vars + 1))
+        for var in self.variables:
+            self.known[var] = 1
+        self.state = SolverState(num_vars)
+        self.propagator.setup(num_vars)
+        memory = self.arena.memory
+        for cref in self.clauses:
+            if memory[cref] > 1:
+                self.propagator.attach(memory, cref)
+        # Variable -> 1 while it is marked during conflict analysis.
+        self.seen = array('b', bytes(num_vars + 1))
+        # Trail size at level 0 when the satisfied clauses were last removed.
+        self.simplified_trail_size = 0
+        # Assumptions (DIMACS literals) responsible for the last UNSAT answer.
+        self.failed = []
+        self.phases.setup(num_vars)
+        self.heuristic.setup(self)
+
+    def unit_propagate(self):
+        """
+        Propagates the pending literals of the trail with the propagation engine.
+
+        Returns:
+          The reference of a conflicting clause if a conflict is found during propagation; otherwise, returns None.
+        """
+        return self.propagator.propagate(self.state, self.arena.memory)
+
+    def pick_branching_literal(self):
+        """
+        Returns the code of the literal chosen by the decision heuristic, or None if all
+        variables are assigned.
+        """
+        return self.heuristic.pick(self)
+
+    def conflict_analysis(self, conflict_clause):
+        """
+        Conducts conflict analysis to find the First UIP.
+        
+        The trail is walked backwards once, from the conflict, resolving the reason of every
+        current-level literal marked in self.seen until a single one is left: the first UIP.
+        Literals of lower levels go to the learned clause as they are met; level-0 literals are
+        always False and are dropped. The clause is then minimized (see literal_redundant).
+        
+        The learned clause is returned with the negated UIP first and a literal of the backjump
+        level second, so that both positions can be watched.
+        """
+        state = self.state
+        levels, reasons, trail = state.levels, state.reasons, state.trail
+        memory = self.arena.memory
+        seen = self.seen
+        current_level = state.decision_level
+        learned_clause = [0]  # Position 0 is reserved for the UIP.
+        pending = 0  # Marked current-level literals not yet resolved.
+        cref = conflict_clause
+        pivot = -1   # Literal whose reason is being resolved (none for the conflict clause).
+        index = len(trail) - 1
+        while True:
+            self.clause_db.on_clause_used(self, cref)
+            first = cref + HEADER_SIZE
+            for k in range(first, first + memory[cref]):
+                code = memory[k]
+                var = code >> 1
+                if code != pivot and not seen[var] and levels[var] > 0:
+                    seen[var] = 1
+                    if levels[var] >= current_level:
+                        pending += 1
+                    else:
+                        learned_clause.append(code)
+            # The next literal to resolve is the latest marked one on the trail.
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            pivot = trail[index]
+            index -= 1
+            seen[pivot >> 1] = 0
+            pending -= 1
+            if pending == 0:
+                break
+            cref = reasons[pivot >> 1]
+        learned_clause[0] = pivot ^ 1
+
+        # Drop the literals implied by the rest of the clause.
+        abstract_levels = 0
+        for code in learned_clause[1:]:
+            abstract_levels |= 1 << (levels[code >> 1] & 31)
+        marked = [code >> 1 for code in learned_clause[1:]]
+        minimized = [learned_clause[0]]
+        for code in learned_clause[1:]:
+            if reasons[code >> 1] < 0 or not self.literal_redundant(code, abstract_levels, marked):
+                minimized.append(code)
+        for var in marked:
+            seen[var] = 0
+        learned_clause = minimized
+
+        # Determine the backjump level and put one of its literals second.
+        backjump_level = 0
+        for i in range(1, len(learned_clause)):
+            lvl = levels[learned_clause[i] >> 1]
+            if lvl > backjump_level:
+                backjump_level = lvl
+                learned_clause[1], learned_clause[i] = learned_clause[i], learned_clause[1]
+
+        return learned_clause, backjump_level
+
+    def literal_redundant(self, code, abstract_levels, marked):
+        """
+        Checks whether a literal of the learned clause is implied by the others, following the
+        reasons recursively (with an explicit stack) until only marked literals are reached.
+        
+        abstract_levels is a bit mask of the levels in the clause, used to give up early on
+        literals from other levels. Variables found redundant stay marked in self.seen and are
+        appended to marked; on failure the marks added by this call are undone.
+        """
+        levels, reasons = self.state.levels, self.state.reasons
+        memory = self.arena.memory
+        seen = self.seen
+        top = len(marked)
+        stack = [code >> 1]
+        while stack:
+            var = stack.pop()
+            cref = reasons[var]
+            first = cref + HEADER_SIZE
+            for k in range(first, first + memory[cref]):
+                other = memory[k] >> 1
+                if other == var or seen[other] or levels[other] == 0:
+                    continue
+                if reasons[other] >= 0 and (abstract_levels >> (levels[other] & 31)) & 1:
+                    seen[other] = 1
+                    stack.append(other)
+                    marked.append(other)
+                else:
+                    for marked_var in marked[top:]:
+                        seen[marked_var] = 0
+                    del marked[top:]
+                    return False
+        return True
+
+    def backjump(self, level):
+        """
+        Backtracks the search to the given decision level by undoing assignments above that level.
+        """
+        undone = self.state.backtrack(level)
+        self.phases.on_unassign(undone)
+        self.heuristic.on_unassign(self, undone)
+
+    def learn(self, learned_clause):
+        """
+        Adds the learned clause to the arena and asserts its first literal, which is unit
+        right after backjumping.
+        
+        Returns the reference of the new clause.
+        """
+        # The asserting literal is unassigned after backjumping: it adds its own level to the LBD.
+        lbd = self.clause_db.compute_lbd(self.state.levels, learned_clause) + 1
+        cref = self.arena.add(learned_clause, learned=True, lbd=lbd)
+        self.learnts.append(cref)
+        self.clause_db.on_learn(cref)
+        if len(learned_clause) > 1:
+            self.propagator.attach(self.arena.memory, cref)
+        self.state.assign(learned_clause[0], cref)
+        self.heuristic.on_learn(self, cref)
+        return cref
+
+    def decide(self, code):
+        """
+        Opens a new decision level and assigns the chosen literal.
+        """
+        self.state.new_decision_level()
+        self.state.assign(code, -1)  # Decision assignments have no reason clause.
+
+    def assign_unit_clauses(self):
+        """
+        Unit clauses are not watched: assign them at level 0 before searching.
+        
+        Returns False if the formula contains an empty clause or two opposite unit clauses.
+        """
+        values = self.state.values
+        memory = self.arena.memory
+        for cref in self.clauses:
+            size = memory[cref]
+            if size == 0:
+                return False
+            if size == 1:
+                code = memory[cref + HEADER_SIZE]
+                if values[code] < 0:
+                    return False
+                if values[code] == 0:
+                    self.state.assign(code, cref)
+        return True
+
+    def is_locked(self, cref):
+        """
+        A clause is locked while it is the reason of one of its literals. Propagation keeps the
+        implied literal of a long clause in position 0; a binary clause may imply either literal.
+        """
+        memory = self.arena.memory
+        reasons = self.state.reasons
+        values = self.state.values
+        first = cref + HEADER_SIZE
+        for k in range(first, first + min(2, memory[cref])):
+            code = memory[k]
+            if values[code] > 0 and reasons[code >> 1] == cref:
+                return True
+        return False
+
+    def simplify(self):
+        """
+        At decision level 0, deletes the clauses satisfied by the level-0 assignment, which can
+        never take part in a conflict again. Does nothing if no literal was fixed since the last call.
+        """
+        state = self.state
+        if state.decision_level != 0 or len(state.trail) == self.simplified_trail_size:
+            return
+        self.simplified_trail_size = len(state.trail)
+        values = state.values
+        arena = self.arena
+        for crefs in (self.clauses, self.learnts):
+            kept = []
+            for cref in crefs:
+                if any(values[code] > 0 for code in arena.literals(cref)) and not self.is_locked(cref):
+                    arena.delete(cref)
+                else:
+                    kept.append(cref)
+            crefs[:] = kept
+        # A deleted clause may stay in the watch lists until the next compaction: one of its
+        # literals is True at level 0, so propagation can never make it unit or conflicting.
+        if arena.wasted > self.GARBAGE_FRACTION * len(arena.memory):
+            self.collect_garbage()
+
+    def collect_garbage(self):
+        """
+        Compacts the arena and rewrites every clause reference: the clause lists, the reasons of
+        the assigned variables and the watch lists, which also drop the deleted clauses.
+        """
+        relocation = self.arena.compact()
+        self.clauses = [relocation[cref] for cref in self.clauses]
+        self.learnts = [relocation[cref] for cref in self.learnts]
+        reasons = self.state.reasons
+        for code in self.state.trail:
+            var = code >> 1
+            if reasons[var] >= 0:
+                reasons[var] = relocation[reasons[var]]
+        self.propagator.relocate(relocation)
+        self.clause_db.relocate(relocation)
+        self.heuristic.on_relocate(self, relocation)
+
+    def add_variables(self, new_variables):
+        """
+        Makes room in every component for variables that were not in the formula yet.
+        """
+        new_variables = sorted(new_variables)
+        num_vars = max(self.state.num_vars, new_variables[-1])
+        extra = num_vars - self.state.num_vars
+        self.state.grow(num_vars)
+        self.seen.extend(bytes(extra))
+        self.known.extend(bytes(extra))
+        for var in new_variables:
+            self.known[var] = 1
+        self.variables.extend(new_variables)
+        self.propagator.grow(num_vars)
+        self.phases.grow(num_vars)
+        self.heuristic.add_variables(self, new_variables)
+
+    def add_missing_variables(self, codes):
+        """
+        Adds the variables of the literal codes that are not in the formula yet.
+        """
+        num_vars, known = self.state.num_vars, self.known
+        new_variables = {code >> 1 for code in codes if (code >> 1) > num_vars or not known[code >> 1]}
+        if new_variables:
+            self.add_variables(new_variables)
+
+    def add_clause(self, clause):
+        """
+        Adds a clause (a list of DIMACS literals) to the formula, for the next calls to solve().
+
+        The search goes back to level 0 first. A clause satisfied at level 0 is not stored, and
+        the literals False at level 0 are dropped from the others.
+        """
+        if self.preprocessor is not None:
+            raise ValueError("clauses cannot be added to a preprocessed formula")
+        self.backjump(0)
+        codes = list(dict.fromkeys(to_code(literal) for literal in clause))
+        self.add_missing_variables(codes)
+        values = self.state.values
+        if any(values[code] > 0 for code in codes):
+            return
+        codes = [code for code in codes if values[code] == 0]
+        cref = self.arena.add(codes)
+        self.clauses.append(cref)
+        if len(codes) > 1:
+            self.propagator.attach(self.arena.memory, cref)
+        elif codes:
+            self.state.assign(codes[0], cref)
+        # An empty clause stays in self.clauses: every later call answers UNSAT.
+        self.heuristic.on_add_clause(self, cref)
+
+    def failed_assumptions(self):
+        """
+        Returns the assumptions (DIMACS literals) used to prove the last UNSAT answer of solve():
+        the formula is unsatisfiable under them alone. It is empty when the formula is
+        unsatisfiable without assumptions.
+        """
+        return list(self.failed)
+
+    def analyze_final(self, code):
+        """
+        Called when the assumption code is False: follows the reasons of its negation back to the
+        assumptions it depends on.
+
+        Returns the failed assumptions, code included, as DIMACS literals.
+        """
+        state = self.state
+        levels, reasons, trail = state.levels, state.reasons, state.trail
+        memory = self.arena.memory
+        seen = self.seen
+        failed = [to_literal(code)]
+        if state.decision_level == 0 or levels[code >> 1] == 0:
+            return failed
+        seen[code >> 1] = 1
+        for i in range(len(trail) - 1, state.trail_lim[0] - 1, -1):
+            var = trail[i] >> 1
+            if not seen[var]:
+                continue
+            seen[var] = 0
+            cref = reasons[var]
+            if cref < 0:
+                # Only assumptions are decided below the assumption levels.
+                failed.append(to_literal(trail[i]))
+                continue
+            first = cref + HEADER_SIZE
+            for k in range(first, first + memory[cref]):
+                other = memory[k] >> 1
+                if other != var and levels[other] > 0:
+                    seen[other] = 1
+        return failed
+
+    def model(self):
+        """
+        Returns the current (complete) assignment as a dictionary variable -> True/False, extended
+        to the variables removed by the preprocessor.
+        """
+        model = self.state.model(self.variables)
+        if self.preprocessor is not None:
+            model = self.preprocessor.extend_model(model)
+        return model
+
+    def solve(self, assumptions=()):
+        """
+        The main solving loop which alternates between unit propagation, conflict analysis, and branching.
+
+        Parameters:
+          assumptions: DIMACS literals assumed True for this call only. They are decided first,
+                       one per decision level; failed_assumptions() tells which of them made the
+                       formula UNSAT.
+        
+        Returns:
+          A satisfying assignment as a dictionary mapping variables to Boolean values if the formula is SAT;
+          Otherwise, returns None indicating the formula is UNSAT.
+        """
+        if assumptions and self.preprocessor is not None:
+            raise ValueError("assumptions are not supported on a preprocessed formula")
+        self.backjump(0)
+        self.failed = []
+        assumptions = [to_code(literal) for literal in assumptions]
+        self.add_missing_variables(assumptions)
+        if not self.assign_unit_clauses():
+            return None
+        while True:
+            conflict = self.unit_propagate()
+            if conflict is not None:
+                if self.state.decision_level == 0:
+                    # Conflict at level 0 indicates an unsolvable (UNSAT) condition. The empty
+                    # clause keeps it for the next calls.
+                    self.clauses.append(self.arena.add(()))
+                    return None
+                learned_clause, backjump_level = self.conflict_analysis(conflict)
+                trail_size = len(self.state.trail)
+                self.phases.on_conflict(self.state)
+                # Backjump to the appropriate decision level and learn the clause.
+                self.backjump(backjump_level)
+                cref = self.learn(learned_clause)
+                self.restart_policy.on_conflict(self.arena.lbd(cref), trail_size)
+                if self.clause_db.should_reduce():
+                    self.clause_db.reduce(self)
+                if self.restart_policy.should_restart():
+                    # Restart: clear assignments above level 0, preserve learned clauses
+                    self.backjump(0)
+                    self.restart_policy.on_restart()
+                    self.phases.on_restart()
+                if self.phases.should_rephase():
+                    self.phases.rephase()
+            else:
+                self.simplify()
+                state = self.state
+                if state.decision_level < len(assumptions):
+                    code = assumptions[state.decision_level]
+                    value = state.values[code]
+                    if value > 0:
+                        state.new_decision_level()  # Already True: an empty level keeps the count.
+                    elif value < 0:
+                        self.failed = self.analyze_final(code)
+                        return None
+                    else:
+                        self.decide(code)
+                    continue
+                code = self.pick_branching_literal()
+                if code is None:
+                    return self.model()
+                self.decide(code)
+
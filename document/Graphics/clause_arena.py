@@ -0,0 +1,82 @@
+from array import array
+
+# Every clause is stored in the arena as a header followed by its literal codes:
+#   [size, flags, lbd, code_1, ..., code_size]
+# and is referenced by the integer offset of its header (its "cref").
+HEADER_SIZE = 3
+SIZE, FLAGS, LBD = 0, 1, 2
+
+LEARNED = 1  # The clause was learned from a conflict.
+DELETED = 2  # The clause was deleted; its space is reclaimed by the next compaction.
+
+
+class ClauseArena:
+    """
+    Contiguous storage for all the clauses of a solver in a single array('i').
+    """
+
+    __slots__ = ('memory', 'wasted')
+
+    def __init__(self):
+        self.memory = array('i')
+        self.wasted = 0  # Number of array slots taken by deleted clauses.
+
+    def add(self, codes, learned=False, lbd=0):
+        """
+        Stores a clause given as an iterable of literal codes and returns its reference.
+        """
+        cref = len(self.memory)
+        self.memory.extend((0, LEARNED if learned else 0, lbd))
+        self.memory.extend(codes)
+        self.memory[cref + SIZE] = len(self.memory) - cref - HEADER_SIZE
+        return cref
+
+    def size(self, cref):
+        return self.memory[cref + SIZE]
+
+    def literals(self, cref):
+        """
+        Returns a copy of the literal codes of the clause.
+        """
+        start = cref + HEADER_SIZE
+        return self.memory[start:start + self.memory[cref + SIZE]]
+
+    def is_learned(self, cref):
+        return self.memory[cref + FLAGS] & LEARNED != 0
+
+    def is_deleted(self, cref):
+        return self.memory[cref + FLAGS] & DELETED != 0
+
+    def lbd(self, cref):
+        return self.memory[cref + LBD]
+
+    def set_lbd(self, cref, lbd):
+        self.memory[cref + LBD] = lbd
+
+    def delete(self, cref):
+        """
+        Marks the clause as deleted. The caller must stop using its reference.
+        """
+        if not self.memory[cref + FLAGS] & DELETED:
+            self.memory[cref + FLAGS] |= DELETED
+            self.wasted += HEADER_SIZE + self.memory[cref + SIZE]
+
+    def compact(self):
+        """
+        Moves the live clauses to a new array, dropping the deleted ones.
+
+        Returns a dictionary mapping the old reference of every live clause to its new reference.
+        """
+        memory = self.memory
+        compacted = array('i')
+        relocation = {}
+        cref = 0
+        while cref < len(memory):
+            end = cref + HEADER_SIZE + memory[cref + SIZE]
+            if not memory[cref + FLAGS] & DELETED:
+                relocation[cref] = len(compacted)
+                compacted.extend(memory[cref:end])
+            cref = end
+        self.memory = compacted
+        self.wasted = 0
+        return relocation
@@ -0,0 +1,102 @@
+from clause_arena import FLAGS, HEADER_SIZE, LBD
+
+USED = 4  # Arena flag: the learned clause took part in a conflict since the last reduction.
+
+
+class ClauseDatabase:
+    """
+    Manages the learned clauses of a solver in three tiers by LBD (glue, the number of distinct
+    decision levels among the literals of a clause):
+      - core (LBD <= core_lbd): kept forever;
+      - tier 2 (LBD <= tier2_lbd): kept while they keep being used in conflicts;
+      - local: the rest, and the tier-2 clauses left unused since the previous reduction.
+    Every reduction deletes the less active half of the local tier. Reductions are scheduled every
+    reduce_interval conflicts, an interval that grows by reduce_increment after each one.
+    """
+
+    __slots__ = ('core_lbd', 'tier2_lbd', 'reduce_interval', 'reduce_increment', 'next_reduce', 'conflicts',
+                 'activity', 'bump_increment', 'decay_factor')
+
+    # Clause activities are rescaled when one of them exceeds this bound.
+    RESCALE_LIMIT = 1e20
+
+    def __init__(self, reduce_interval=2000, reduce_increment=300, core_lbd=2, tier2_lbd=6, decay_factor=0.999):
+        self.core_lbd = core_lbd
+        self.tier2_lbd = tier2_lbd
+        self.reduce_interval = reduce_interval
+        self.reduce_increment = reduce_increment
+        self.next_reduce = reduce_interval  # Conflict count that triggers the next reduction.
+        self.conflicts = 0
+        self.activity = {}  # Learned clause reference -> activity.
+        # Activities decay lazily, like VSIDS: later bumps grow by 1 / decay_factor.
+        self.bump_increment = 1.0
+        self.decay_factor = decay_factor
+
+    def compute_lbd(self, levels, codes):
+        """
+        Returns the number of distinct decision levels among the assigned literals of the clause.
+        """
+        return len({levels[code >> 1] for code in codes if levels[code >> 1] >= 0})
+
+    def on_learn(self, cref):
+        """
+        Registers a new learned clause after a conflict.
+        """
+        self.conflicts += 1
+        self.activity[cref] = self.bump_increment
+        self.bump_increment /= self.decay_factor
+        if self.bump_increment > self.RESCALE_LIMIT:
+            for key in self.activity:
+                self.activity[key] /= self.RESCALE_LIMIT
+            self.bump_increment /= self.RESCALE_LIMIT
+
+    def on_clause_used(self, solver, cref):
+        """
+        Called for every clause resolved during conflict analysis. Learned clauses are bumped,
+        marked as used and, if their glue dropped, moved to a better tier.
+        """
+        memory = solver.arena.memory
+        if cref not in self.activity:
+            return  # Original clause.
+        self.activity[cref] += self.bump_increment
+        memory[cref + FLAGS] |= USED
+        if memory[cref + LBD] > self.core_lbd:
+            first = cref + HEADER_SIZE
+            lbd = self.compute_lbd(solver.state.levels, memory[first:first + memory[cref]])
+            if lbd < memory[cref + LBD]:
+                memory[cref + LBD] = lbd
+
+    def should_reduce(self):
+        return self.conflicts >= self.next_reduce
+
+    def reduce(self, solver):
+        """
+        Deletes half of the local tier, the clauses with the lowest activity first (and among
+        equally active ones, the highest LBD), then compacts the solver's clause arena.
+        """
+        self.reduce_interval += self.reduce_increment
+        self.next_reduce = self.conflicts + self.reduce_interval
+        memory = solver.arena.memory
+        local = []
+        for cref in solver.learnts:
+            lbd = memory[cref + LBD]
+            if lbd <= self.core_lbd:
+                continue
+            used = memory[cref + FLAGS] & USED
+            memory[cref + FLAGS] &= ~USED
+            if (lbd <= self.tier2_lbd and used) or solver.is_locked(cref):
+                continue
+            local.append(cref)
+        local.sort(key=lambda cref: (self.activity[cref], -memory[cref + LBD]))
+        deleted = set(local[:len(local) // 2])
+        for cref in deleted:
+            solver.arena.delete(cref)
+            del self.activity[cref]
+        solver.learnts = [cref for cref in solver.learnts if cref not in deleted]
+        solver.collect_garbage()
+
+    def relocate(self, relocation):
+        """
+        Follows the clause references moved by a compaction of the arena.
+        """
+        self.activity = {relocation[cref]: value for cref, value in self.activity.items() if cref in relocation}
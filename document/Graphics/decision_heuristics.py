@@ -0,0 +1,304 @@
+from array import array
+
+from var_heap import VarHeap
+
+
+class DecisionHeuristic:
+    """
+    Chooses the decision literals of a CDCL solver.
+
+    The solver calls setup() once its clauses are loaded, pick() before each decision,
+    on_unassign() after every backjump, on_learn() after learning a clause and on_relocate()
+    after compacting its clause arena. Between two solve() calls, add_variables() and
+    on_add_clause() report the variables and clauses added to the formula.
+    """
+
+    __slots__ = ()
+
+    def setup(self, solver):
+        pass
+
+    def pick(self, solver):
+        """
+        Returns the code of the literal to assign, or None if all variables are assigned.
+        """
+        raise NotImplementedError
+
+    def on_unassign(self, solver, codes):
+        """
+        Takes back the variables of the unassigned literal codes.
+        """
+
+    def on_learn(self, solver, cref):
+        pass
+
+    def on_relocate(self, solver, relocation):
+        pass
+
+    def add_variables(self, solver, variables):
+        """
+        Takes new variables, already appended to solver.variables; the solver state has grown.
+        """
+
+    def on_add_clause(self, solver, cref):
+        pass
+
+
+class NaiveHeuristic(DecisionHeuristic):
+    """
+    Selects the next unassigned variable found in the formula; its polarity comes from the
+    solver's phases.
+
+    (In a production solver, better heuristics like VSIDS are used.)
+    """
+
+    __slots__ = ('var_position', 'next_position')
+
+    def setup(self, solver):
+        # Variables are scanned in solver.variables order from next_position; backjumps move it back.
+        self.var_position = array('i', bytes(4 * (solver.state.num_vars + 1)))
+        for position, var in enumerate(solver.variables):
+            self.var_position[var] = position
+        self.next_position = 0
+
+    def pick(self, solver):
+        levels = solver.state.levels
+        variables = solver.variables
+        # Every variable before next_position is assigned.
+        while self.next_position < len(variables):
+            var = variables[self.next_position]
+            if levels[var] < 0:
+                return solver.phases.decision(var)
+            self.next_position += 1
+        return None
+
+    def on_unassign(self, solver, codes):
+        var_position = self.var_position
+        for code in codes:
+            position = var_position[code >> 1]
+            if position < self.next_position:
+                self.next_position = position
+
+    def add_variables(self, solver, variables):
+        self.var_position.frombytes(bytes(4 * (solver.state.num_vars + 1 - len(self.var_position))))
+        for position in range(len(solver.variables) - len(variables), len(solver.variables)):
+            self.var_position[solver.variables[position]] = position
+
+
+class VSIDSHeuristic(DecisionHeuristic):
+    """
+    VSIDS: selects the unassigned variable with the highest activity (ties broken by the smallest
+    variable), with the polarity given by the solver's phases. The variables of every learned
+    clause are bumped, and all activities decay by decay_factor after each conflict.
+    """
+
+    __slots__ = ('activity', 'decay_factor', 'bump_increment', 'order')
+
+    # Activities are rescaled when one of them exceeds this bound.
+    RESCALE_LIMIT = 1e100
+
+    def __init__(self, decay_factor=0.95):
+        self.decay_factor = decay_factor
+
+    def setup(self, solver):
+        # Maps variable to its activity score for VSIDS (all variables start at 0.0).
+        self.activity = array('d', bytes(8 * (solver.state.num_vars + 1)))
+        # Instead of multiplying every activity by decay_factor, later bumps grow by 1 / decay_factor,
+        # which keeps the same ordering.
+        self.bump_increment = 1.0
+        # Unassigned variables ordered by activity (assigned ones are removed lazily on pick).
+        self.order = VarHeap(self.activity, solver.variables)
+
+    def pick(self, solver):
+        levels = solver.state.levels
+        order = self.order
+        while order:
+            var = order.pop()
+            if levels[var] < 0:
+                return solver.phases.decision(var)
+        return None
+
+    def on_unassign(self, solver, codes):
+        order = self.order
+        for code in codes:
+            order.insert(code >> 1)
+
+    def bump(self, var):
+        """
+        Increases the activity of var, rescaling every activity if it grows too large.
+        """
+        activity = self.activity
+        activity[var] += self.bump_increment
+        if activity[var] > self.RESCALE_LIMIT:
+            for v in range(len(activity)):
+                activity[v] *= 1.0 / self.RESCALE_LIMIT
+            self.bump_increment *= 1.0 / self.RESCALE_LIMIT
+        self.order.increased(var)
+
+    def on_learn(self, solver, cref):
+        # Update activities for variables in the learned clause
+        for code in solver.arena.literals(cref):
+            self.bump(code >> 1)
+        # Decay all activities (lazily, by growing the next bumps)
+        self.bump_increment /= self.decay_factor
+
+    def add_variables(self, solver, variables):
+        size = solver.state.num_vars + 1
+        self.activity.frombytes(bytes(8 * (size - len(self.activity))))
+        self.order.grow(size)
+        for var in variables:
+            self.order.insert(var)
+
+
+class DLISHeuristic(DecisionHeuristic):
+    """
+    DLIS: selects the literal that occurs most often in the clauses not yet satisfied. When both
+    literals of the variable occur equally often, the solver's phases decide.
+
+    The counts are kept incrementally through occurrence lists. Assignments are counted lazily,
+    when a decision is needed, so the literals propagated and undone between two decisions never
+    touch the counts.
+    """
+
+    __slots__ = ('occurrences', 'true_count', 'counts', 'scores', 'order', 'counted', 'counted_head')
+
+    def setup(self, solver):
+        """
+        Builds the occurrence lists, counts and heap from the current clauses, with no
+        assignment counted yet.
+        """
+        num_codes = 2 * (solver.state.num_vars + 1)
+        self.occurrences = [[] for _ in range(num_codes)]  # Literal code -> references of the clauses containing it.
+        self.true_count = {}                                # Clause reference -> number of its literals counted as True.
+        self.counts = array('i', bytes(4 * num_codes))      # Literal code -> occurrences in unsatisfied clauses.
+        # Variable -> DLIS score (max(pos, neg), pos + neg); VarHeap breaks ties by the smallest variable.
+        self.scores = [(0, 0)] * (solver.state.num_vars + 1)
+        self.order = VarHeap(self.scores)
+        self.counted = array('b', bytes(solver.state.num_vars + 1))  # Variable -> 1 if its value is counted.
+        self.counted_head = 0  # Assignments on the trail before this index are reflected in the counts.
+        for cref in solver.clauses + solver.learnts:
+            self.add_occurrences(solver, cref)
+        for var in solver.variables:
+            self.order.insert(var)
+
+    def add_occurrences(self, solver, cref):
+        """
+        Registers a clause in the occurrence lists and, unless a counted literal satisfies it,
+        in the counts.
+        """
+        values, counted = solver.state.values, self.counted
+        clause = solver.arena.literals(cref)
+        true_count = sum(1 for code in clause if values[code] > 0 and counted[code >> 1])
+        self.true_count[cref] = true_count
+        for code in clause:
+            self.occurrences[code].append(cref)
+            if not true_count:
+                self.counts[code] += 1
+        for code in clause:
+            self.update_score(code >> 1)
+
+    def update_score(self, var):
+        counts = self.counts
+        pos = counts[2 * var]
+        neg = counts[2 * var + 1]
+        old = self.scores[var]
+        new = (max(pos, neg), pos + neg)
+        self.scores[var] = new
+        if new > old:
+            self.order.increased(var)
+        elif new < old:
+            self.order.decreased(var)
+
+    def count_assignment(self, solver, code, delta):
+        """
+        Updates the counts when the literal becomes True (delta = -1) or is unassigned (delta = 1):
+        the clauses containing it become satisfied or unsatisfied.
+        """
+        arena = solver.arena
+        true_count = self.true_count
+        counts = self.counts
+        self.counted[code >> 1] = delta < 0
+        changed = set()
+        for cref in self.occurrences[code]:
+            true_count[cref] -= delta
+            # Only the first satisfying literal (or the last one removed) changes the clause status.
+            if true_count[cref] == (1 if delta < 0 else 0):
+                for other in arena.literals(cref):
+                    counts[other] += delta
+                    changed.add(other >> 1)
+        for var in changed:
+            self.update_score(var)
+
+    def pick(self, solver):
+        state = solver.state
+        # Bring the counts up to date with the assignments made since the last decision.
+        trail = state.trail
+        while self.counted_head < len(trail):
+            self.count_assignment(solver, trail[self.counted_head], -1)
+            self.counted_head += 1
+
+        levels = state.levels
+        order = self.order
+        while order:
+            var = order.pop()
+            if levels[var] < 0:
+                pos = self.counts[2 * var]
+                neg = self.counts[2 * var + 1]
+                if pos == neg:
+                    return solver.phases.decision(var)
+                return 2 * var if pos > neg else 2 * var + 1
+        return None
+
+    def on_unassign(self, solver, codes):
+        """
+        Reverts the counts of the unassigned literals that had been counted and puts their
+        variables back into the DLIS heap.
+        """
+        start = len(solver.state.trail)  # The trail has already been truncated here.
+        for i in range(self.counted_head - start - 1, -1, -1):
+            self.count_assignment(solver, codes[i], 1)
+        self.counted_head = min(self.counted_head, start)
+        order = self.order
+        for code in codes:
+            order.insert(code >> 1)
+
+    def on_learn(self, solver, cref):
+        self.add_occurrences(solver, cref)
+
+    def add_variables(self, solver, variables):
+        size = solver.state.num_vars + 1
+        for _ in range(len(self.occurrences), 2 * size):
+            self.occurrences.append([])
+        self.counts.frombytes(bytes(4 * (2 * size - len(self.counts))))
+        self.scores.extend([(0, 0)] * (size - len(self.scores)))
+        self.counted.extend(bytes(size - len(self.counted)))
+        self.order.grow(size)
+        for var in variables:
+            self.order.insert(var)
+
+    def on_add_clause(self, solver, cref):
+        self.add_occurrences(solver, cref)
+
+    def on_relocate(self, solver, relocation):
+        """
+        Rewrites the occurrence lists after a compaction of the arena, which happens at every
+        reduction of the learned clauses. A deleted clause (missing from relocation) is in the
+        lists of its own literals, so the counts it added, if no counted literal satisfies it,
+        are taken back from there without reading the arena.
+        """
+        counts = self.counts
+        true_count = self.true_count
+        changed = []
+        for code, crefs in enumerate(self.occurrences):
+            kept = []
+            for cref in crefs:
+                new = relocation.get(cref)
+                if new is not None:
+                    kept.append(new)
+                elif not true_count[cref]:
+                    counts[code] -= 1
+                    changed.append(code >> 1)
+            crefs[:] = kept
+        self.true_count = {relocation[cref]: value for cref, value in true_count.items() if cref in relocation}
+        for var in set(changed):
+            self.update_score(var)
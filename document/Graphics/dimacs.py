@@ -0,0 +1,188 @@
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import re
+
+from clause_arena import ClauseArena
+from solver_state import to_literal
+
+# Bytes read per block when streaming a file.
+BLOCK_SIZE = 1 << 22
+
+# Comment lines, the 'p cnf' header and the '%' end marker of the SATLIB benchmarks.
+SPECIAL_LINE = re.compile(rb"^[ \t]*([cp%])[^\n]*", re.MULTILINE)
+
+# Magic numbers of the accepted compressed formats.
+COMPRESSED_FORMATS = (
+    (b"\x1f\x8b", gzip.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+    (b"BZh", bz2.open),
+)
+
+
+class DimacsFormula:
+    """
+    A formula loaded by load_dimacs(): the clauses are already in a ClauseArena as literal codes,
+    ready to be handed to a CDCLSolver, which takes over the arena.
+
+    Iterating over it yields the clauses as lists of DIMACS literals, for the code that needs them
+    that way (the preprocessor, model checks).
+    """
+
+    __slots__ = ('arena', 'clauses', 'variables', 'num_vars', 'num_clauses')
+
+    def __init__(self, arena, clauses, variables, num_vars, num_clauses):
+        self.arena = arena
+        self.clauses = clauses      # References of the clauses, in file order.
+        self.variables = variables  # Sorted variables occurring in the clauses.
+        self.num_vars = num_vars    # Numbers given by the 'p cnf' header (0 if missing).
+        self.num_clauses = num_clauses
+
+    def __len__(self):
+        return len(self.clauses)
+
+    def __iter__(self):
+        for cref in self.clauses:
+            yield [to_literal(code) for code in self.arena.literals(cref)]
+
+
+def open_dimacs(path):
+    """
+    Opens a DIMACS file in binary mode, decompressing it if its first bytes are those of a
+    gzip, xz or bzip2 file.
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(6)
+    for signature, open_compressed in COMPRESSED_FORMATS:
+        if magic.startswith(signature):
+            return open_compressed(path, 'rb')
+    return open(path, 'rb')
+
+
+def read_blocks(path, block_size=BLOCK_SIZE, use_mmap=False):
+    """
+    Yields the file in blocks of bytes that end at a line break, so that no number or comment
+    is split between two blocks. With use_mmap, an uncompressed file is memory-mapped instead of
+    read.
+    """
+    with open_dimacs(path) as f:
+        if use_mmap and isinstance(f, io.BufferedReader):
+            yield from _mapped_blocks(f, block_size)
+            return
+        rest = b""
+        while True:
+            data = f.read(block_size)
+            if not data:
+                break
+            data = rest + data
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                rest = data
+                continue
+            rest = data[cut:]
+            yield data[:cut]
+        if rest:
+            yield rest
+
+
+def _mapped_blocks(f, block_size):
+    if f.seek(0, 2) == 0:
+        return  # Empty files cannot be mapped.
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        start = 0
+        while start < len(mapped):
+            end = min(start + block_size, len(mapped))
+            if end < len(mapped):
+                cut = mapped.rfind(b"\n", start, end) + 1
+                if cut == 0:  # A line longer than a block.
+                    cut = mapped.find(b"\n", end) + 1 or len(mapped)
+                end = cut
+            yield mapped[start:end]
+            start = end
+
+
+def load_dimacs(path, block_size=BLOCK_SIZE, use_mmap=False):
+    """
+    Loads a DIMACS CNF file into a new ClauseArena without building a list per clause.
+
+    The file is tokenized block by block and the clauses of each block are appended to the arena
+    memory with a single extend. Comment lines ('c'), the 'p cnf' header and the '%' end marker
+    of the SATLIB benchmarks are handled; a clause may span several lines or blocks and the last
+    one may miss its terminating 0. As in CDCLSolver, repeated literals are dropped.
+
+    Returns a DimacsFormula, to be passed to a solver as its formula.
+    """
+    arena = ClauseArena()
+    clauses = []
+    codes_seen = set()
+    header = [0, 0]
+    pending = []  # Codes of a clause that continues in the next block.
+    for block in read_blocks(path, block_size, use_mmap):
+        end_of_formula = False
+        if SPECIAL_LINE.search(block):
+            # Cut the special lines out, reading the header.
+            parts = []
+            position = 0
+            for match in SPECIAL_LINE.finditer(block):
+                parts.append(block[position:match.start()])
+                position = match.end()
+                kind = match.group(1)
+                if kind == b"%":
+                    end_of_formula = True
+                    position = len(block)
+                    break
+                if kind == b"p":
+                    fields = match.group().split()
+                    if len(fields) >= 4:
+                        header = [int(fields[2]), int(fields[3])]
+            parts.append(block[position:])
+            block = b" ".join(parts)
+
+        # Literal codes (see solver_state.py); the terminating 0 becomes code 1, which no literal has.
+        codes = pending
+        codes += [2 * literal if literal > 0 else 1 - 2 * literal for literal in map(int, block.split())]
+        codes_seen.update(codes)
+        start = _store_clauses(arena, codes, clauses)
+        pending = codes[start:]
+        if end_of_formula:
+            break
+
+    if pending:
+        pending.append(1)  # Last clause without its 0.
+        _store_clauses(arena, pending, clauses)
+    codes_seen.discard(1)
+    variables = sorted({code >> 1 for code in codes_seen})
+    return DimacsFormula(arena, clauses, variables, header[0], header[1])
+
+
+def _store_clauses(arena, codes, clauses):
+    """
+    Appends to the arena (with the layout of ClauseArena.add) every clause of codes ended by
+    code 1, and their references to clauses.
+
+    Returns the index in codes where the unfinished clause, if any, starts.
+    """
+    memory = arena.memory
+    base = len(memory)
+    stored = []
+    append_cref = clauses.append
+    index = codes.index
+    start = 0
+    while True:
+        try:
+            end = index(1, start)
+        except ValueError:
+            break
+        clause = codes[start:end]
+        size = end - start
+        if len(set(clause)) != size:
+            clause = list(dict.fromkeys(clause))
+            size = len(clause)
+        append_cref(base + len(stored))
+        stored += (size, 0, 0)  # Header: size, flags, LBD.
+        stored += clause
+        start = end + 1
+    memory.extend(stored)
+    return start
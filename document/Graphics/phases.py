@@ -0,0 +1,112 @@
+from array import array
+
+
+class PhaseManager:
+    """
+    Chooses the polarity of decisions.
+
+      - Saved phases: every unassigned variable remembers the value it had, so backjumps and
+        restarts do not throw away the partial assignment found so far.
+      - Target phases: the assignment of the longest conflict-free trail since the last restart;
+        when use_target is set, decisions follow it before the saved phase.
+      - Best phases: the assignment of the longest conflict-free trail since the last rephasing.
+      - Rephasing: every rephase_interval conflicts (an interval that grows by the same amount each
+        time), the saved phases are reset, cycling through the initial, best, inverted and best
+        phases, and the target is forgotten.
+    """
+
+    __slots__ = ('initial_phase', 'use_target', 'rephase_interval', 'saved', 'target', 'best', 'target_size',
+                 'best_size', 'conflicts', 'next_rephase', 'rephases')
+
+    # Order in which rephasing resets the saved phases.
+    REPHASE_CYCLE = ('original', 'best', 'inverted', 'best')
+
+    def __init__(self, initial_phase=True, use_target=True, rephase_interval=1000):
+        """
+        Parameters:
+          initial_phase: Phase of the variables that were never assigned (True or False).
+          use_target: Whether decisions follow the target phases.
+          rephase_interval: Conflicts before the first rephasing (None disables rephasing).
+        """
+        self.initial_phase = initial_phase
+        self.use_target = use_target
+        self.rephase_interval = rephase_interval
+        self.next_rephase = rephase_interval
+        self.conflicts = 0
+        self.rephases = 0
+
+    def setup(self, num_vars):
+        # Variable -> 1 (True) or 0 (False); the target and best phases use -1 for "none".
+        self.saved = array('b', [1 if self.initial_phase else 0]) * (num_vars + 1)
+        self.target = array('b', [-1]) * (num_vars + 1)
+        self.best = array('b', [-1]) * (num_vars + 1)
+        self.target_size = 0
+        self.best_size = 0
+
+    def grow(self, num_vars):
+        """
+        Gives the initial phase to the new variables up to num_vars.
+        """
+        extra = num_vars + 1 - len(self.saved)
+        if extra > 0:
+            self.saved.extend(array('b', [1 if self.initial_phase else 0]) * extra)
+            self.target.extend(array('b', [-1]) * extra)
+            self.best.extend(array('b', [-1]) * extra)
+
+    def decision(self, var):
+        """
+        Returns the code of the literal of var to decide.
+        """
+        phase = self.target[var] if self.use_target else -1
+        if phase < 0:
+            phase = self.saved[var]
+        return 2 * var + 1 - phase
+
+    def on_unassign(self, codes):
+        saved = self.saved
+        for code in codes:
+            saved[code >> 1] = 1 - (code & 1)
+
+    def on_conflict(self, state):
+        """
+        Called before backjumping: the trail below the conflicting level is conflict-free.
+        """
+        size = state.trail_lim[-1] if state.trail_lim else len(state.trail)
+        if size > self.target_size:
+            self.target_size = size
+            self._copy_trail(state.trail, size, self.target)
+        if size > self.best_size:
+            self.best_size = size
+            self._copy_trail(state.trail, size, self.best)
+        self.conflicts += 1
+
+    def _copy_trail(self, trail, size, phases):
+        for i in range(size):
+            code = trail[i]
+            phases[code >> 1] = 1 - (code & 1)
+
+    def on_restart(self):
+        self.target_size = 0
+
+    def should_rephase(self):
+        return self.next_rephase is not None and self.conflicts >= self.next_rephase
+
+    def rephase(self):
+        """
+        Resets the saved phases following REPHASE_CYCLE and forgets the target and best phases.
+        """
+        mode = self.REPHASE_CYCLE[self.rephases % len(self.REPHASE_CYCLE)]
+        self.rephases += 1
+        self.next_rephase = self.conflicts + (self.rephases + 1) * self.rephase_interval
+        saved = self.saved
+        initial = 1 if self.initial_phase else 0
+        for var in range(1, len(saved)):
+            if mode == 'original':
+                saved[var] = initial
+            elif mode == 'inverted':
+                saved[var] = 1 - initial
+            elif self.best[var] >= 0:
+                saved[var] = self.best[var]
+        for var in range(len(self.target)):
+            self.target[var] = self.best[var] = -1
+        self.target_size = self.best_size = 0
@@ -0,0 +1,233 @@
+class Preprocessor:
+    """
+    Simplifies a formula before search and extends the models of the simplified formula back
+    to the original one.
+
+    The stages, repeated until nothing changes (or max_rounds passes):
+      - unit propagation at level 0;
+      - pure-literal removal;
+      - backward subsumption and self-subsuming resolution (strengthening) through occurrence lists;
+      - bounded variable elimination: a variable is replaced by all the non-tautological resolvents
+        of its clauses when they are no more than the clauses removed.
+    """
+
+    __slots__ = ('pure_literals', 'subsumption', 'elimination', 'max_occurrences', 'max_resolvent_size',
+                 'max_rounds', 'variables', 'clauses', 'occurrences', 'values', 'units', 'eliminated', 'unsat')
+
+    def __init__(self, pure_literals=True, subsumption=True, elimination=True, max_occurrences=16,
+                 max_resolvent_size=20, max_rounds=10):
+        """
+        Parameters:
+          pure_literals, subsumption, elimination: Stages to run (unit propagation always runs).
+          max_occurrences: Variables with more clauses than this are not eliminated.
+          max_resolvent_size: Eliminations producing a longer resolvent are not done.
+          max_rounds: Maximum number of passes over the stages.
+        """
+        self.pure_literals = pure_literals
+        self.subsumption = subsumption
+        self.elimination = elimination
+        self.max_occurrences = max_occurrences
+        self.max_resolvent_size = max_resolvent_size
+        self.max_rounds = max_rounds
+
+    def run(self, formula):
+        """
+        Simplifies the formula (a list of clauses of DIMACS literals).
+
+        Returns the simplified list of clauses, or None if the formula was found unsatisfiable.
+        """
+        self.variables = sorted({abs(literal) for clause in formula for literal in clause})
+        self.clauses = []      # Clause id -> set of literals (None once removed).
+        self.occurrences = {}  # Literal -> ids of the clauses containing it.
+        self.values = {}       # Variable -> value fixed by a unit or a pure literal.
+        self.units = []        # Literals waiting to be fixed.
+        self.eliminated = []   # (variable, its clauses) in elimination order.
+        self.unsat = False
+        for clause in formula:
+            self.add_clause(set(clause))
+        self.propagate()
+        for _ in range(self.max_rounds):
+            if self.unsat:
+                break
+            changed = False
+            if self.pure_literals:
+                changed |= self.remove_pure_literals()
+            if self.subsumption and not self.unsat:
+                changed |= self.subsume()
+            if self.elimination and not self.unsat:
+                changed |= self.eliminate_variables()
+            if not changed:
+                break
+        if self.unsat:
+            return None
+        return [sorted(clause, key=abs) for clause in self.clauses if clause is not None]
+
+    def add_clause(self, clause):
+        """
+        Adds a clause, dropping tautologies, clauses satisfied by the fixed values and false literals.
+        Unit clauses are queued for propagation instead of being stored.
+        """
+        values = self.values
+        if any(-literal in clause for literal in clause):
+            return
+        for literal in list(clause):
+            value = values.get(abs(literal))
+            if value is not None:
+                if value == (literal > 0):
+                    return
+                clause.discard(literal)
+        if not clause:
+            self.unsat = True
+        elif len(clause) == 1:
+            self.units.extend(clause)
+        else:
+            cid = len(self.clauses)
+            self.clauses.append(clause)
+            for literal in clause:
+                self.occurrences.setdefault(literal, set()).add(cid)
+
+    def remove_clause(self, cid):
+        for literal in self.clauses[cid]:
+            self.occurrences[literal].discard(cid)
+        self.clauses[cid] = None
+
+    def strengthen(self, cid, literal):
+        """
+        Removes a false (or redundant) literal from a clause.
+        """
+        clause = self.clauses[cid]
+        clause.discard(literal)
+        self.occurrences[literal].discard(cid)
+        if len(clause) == 1:
+            self.units.extend(clause)
+            self.remove_clause(cid)
+
+    def propagate(self):
+        """
+        Fixes the queued literals: the clauses they satisfy are removed and their negations are
+        removed from the other clauses, which may produce new units.
+        """
+        while self.units and not self.unsat:
+            literal = self.units.pop()
+            var = abs(literal)
+            if var in self.values:
+                if self.values[var] != (literal > 0):
+                    self.unsat = True
+                continue
+            self.values[var] = literal > 0
+            for cid in list(self.occurrences.get(literal, ())):
+                self.remove_clause(cid)
+            for cid in list(self.occurrences.get(-literal, ())):
+                if self.clauses[cid] is not None:
+                    self.strengthen(cid, -literal)
+
+    def active_variables(self):
+        return [var for var in self.variables
+                if self.occurrences.get(var) or self.occurrences.get(-var)]
+
+    def remove_pure_literals(self):
+        """
+        Fixes every literal whose negation occurs in no clause.
+        """
+        for var in self.active_variables():
+            if not self.occurrences.get(-var):
+                self.units.append(var)
+            elif not self.occurrences.get(var):
+                self.units.append(-var)
+        changed = bool(self.units)
+        self.propagate()
+        return changed
+
+    def subsume(self):
+        """
+        For each clause C, shortest first, removes the clauses it subsumes and strengthens the
+        clauses D containing ¬l for a literal l of C such that C \\ {l} ⊆ D (self-subsuming
+        resolution removes ¬l from D).
+        """
+        changed = False
+        clauses, occurrences = self.clauses, self.occurrences
+        order = sorted((cid for cid, clause in enumerate(clauses) if clause is not None),
+                       key=lambda cid: len(clauses[cid]))
+        for cid in order:
+            clause = clauses[cid]
+            if clause is None:
+                continue
+            # Candidates for subsumption must contain the literal of C with the fewest occurrences.
+            rarest = min(clause, key=lambda literal: len(occurrences[literal]))
+            for other in list(occurrences[rarest]):
+                if other != cid and len(clauses[other]) >= len(clause) and clause <= clauses[other]:
+                    self.remove_clause(other)
+                    changed = True
+            for literal in list(clause):
+                for other in list(occurrences.get(-literal, ())):
+                    target = clauses[other]
+                    if target is None or len(target) < len(clause):
+                        continue
+                    if all(other_literal == literal or other_literal in target for other_literal in clause):
+                        self.strengthen(other, -literal)
+                        changed = True
+            self.propagate()
+            if self.unsat:
+                break
+        return changed
+
+    def eliminate_variables(self):
+        """
+        Eliminates the variables whose resolvents are no more than their clauses, cheapest first.
+        """
+        changed = False
+        clauses, occurrences = self.clauses, self.occurrences
+        candidates = sorted(self.active_variables(),
+                            key=lambda var: len(occurrences.get(var, ())) * len(occurrences.get(-var, ())))
+        for var in candidates:
+            positive = list(occurrences.get(var, ()))
+            negative = list(occurrences.get(-var, ()))
+            if not positive and not negative:
+                continue
+            if len(positive) + len(negative) > self.max_occurrences:
+                continue
+            resolvents = []
+            for p in positive:
+                for n in negative:
+                    resolvent = (clauses[p] | clauses[n]) - {var, -var}
+                    if any(-literal in resolvent for literal in resolvent):
+                        continue
+                    resolvents.append(resolvent)
+                    if len(resolvent) > self.max_resolvent_size or len(resolvents) > len(positive) + len(negative):
+                        break
+                else:
+                    continue
+                break
+            else:
+                self.eliminated.append((var, [sorted(clauses[cid], key=abs) for cid in positive + negative]))
+                for cid in positive + negative:
+                    self.remove_clause(cid)
+                for resolvent in resolvents:
+                    self.add_clause(resolvent)
+                self.propagate()
+                changed = True
+                if self.unsat:
+                    break
+        return changed
+
+    def extend_model(self, model):
+        """
+        Extends a model of the simplified formula (a dictionary variable -> True/False) to the
+        variables removed by preprocessing, so that it satisfies the original formula.
+        """
+        model = dict(model)
+        model.update(self.values)
+        eliminated = {var for var, _ in self.eliminated}
+        for var in self.variables:
+            if var not in model and var not in eliminated:
+                model[var] = False  # The variable no longer occurs in any clause.
+        # Undo the eliminations in reverse order: var is True only if a clause containing it
+        # positively is not satisfied by the other variables.
+        for var, var_clauses in reversed(self.eliminated):
+            model[var] = False
+            for clause in var_clauses:
+                if var in clause and not any(model[abs(literal)] == (literal > 0)
+                                             for literal in clause if literal != var):
+                    model[var] = True
+                    break
+        return {var: model[var] for var in self.variables}
@@ -0,0 +1,149 @@
+from array import array
+
+from clause_arena import HEADER_SIZE
+
+
+class TwoWatchedLiterals:
+    """
+    Propagation engine with two watched literals per clause.
+
+    Each clause of three or more literals is registered in the watch lists of its first two
+    literals together with a blocking literal; a clause whose blocker is True is skipped without
+    being read. Binary clauses have their own watch lists holding the other literal, so they
+    never need a replacement search. Unit clauses are not watched.
+    """
+
+    __slots__ = ('watches', 'binary_watches')
+
+    def __init__(self):
+        self.watches = []
+        self.binary_watches = []
+
+    def setup(self, num_vars):
+        """
+        Creates empty watch lists for the literals of variables 1..num_vars.
+        """
+        # Literal code -> flat array [cref, blocker, cref, blocker, ...] of the clauses (3+ literals)
+        # watching it; the blocker is another literal of the clause.
+        self.watches = [array('i') for _ in range(2 * (num_vars + 1))]
+        # Literal code -> flat array [other literal, cref, ...] of the binary clauses containing it.
+        self.binary_watches = [array('i') for _ in range(2 * (num_vars + 1))]
+
+    def grow(self, num_vars):
+        """
+        Adds empty watch lists for the literals of new variables up to num_vars.
+        """
+        for _ in range(len(self.watches), 2 * (num_vars + 1)):
+            self.watches.append(array('i'))
+            self.binary_watches.append(array('i'))
+
+    def attach(self, memory, cref):
+        """
+        Watches the first two literals of the clause, each one using the other as blocker.
+        """
+        first, second = memory[cref + HEADER_SIZE], memory[cref + HEADER_SIZE + 1]
+        if memory[cref] == 2:
+            self.binary_watches[first].extend((second, cref))
+            self.binary_watches[second].extend((first, cref))
+        else:
+            self.watches[first].extend((cref, second))
+            self.watches[second].extend((cref, first))
+
+    def propagate(self, state, memory):
+        """
+        Propagates every literal on the trail that has not been propagated yet.
+
+        Only the clauses watching the negation of a propagated literal are visited. Binary clauses
+        are checked first; a longer clause is skipped when its blocker is True, and otherwise it
+        moves its watch to a non-False literal, becomes unit, or is a conflict. Watch lists are
+        compacted in place.
+
+        Returns:
+          The reference of a conflicting clause if a conflict is found during propagation; otherwise, returns None.
+        """
+        values = state.values
+        trail = state.trail
+        watches = self.watches
+        binary_watches = self.binary_watches
+        while state.propagation_head < len(trail):
+            false_code = trail[state.propagation_head] ^ 1
+            state.propagation_head += 1
+
+            binaries = binary_watches[false_code]
+            for i in range(0, len(binaries), 2):
+                other = binaries[i]
+                value = values[other]
+                if value < 0:
+                    state.propagation_head = len(trail)
+                    return binaries[i + 1]
+                if value == 0:
+                    state.assign(other, binaries[i + 1])
+
+            watchers = watches[false_code]
+            i = j = 0
+            end = len(watchers)
+            while i < end:
+                blocker = watchers[i + 1]
+                if values[blocker] > 0:
+                    watchers[j] = watchers[i]
+                    watchers[j + 1] = blocker
+                    i += 2
+                    j += 2
+                    continue
+                cref = watchers[i]
+                i += 2
+                first = cref + HEADER_SIZE
+                # Keep the false watched literal in position 1.
+                if memory[first] == false_code:
+                    memory[first] = memory[first + 1]
+                    memory[first + 1] = false_code
+                other = memory[first]
+                if other != blocker and values[other] > 0:
+                    watchers[j] = cref
+                    watchers[j + 1] = other
+                    j += 2
+                    continue
+                # Look for a new literal to watch.
+                for k in range(first + 2, first + memory[cref]):
+                    code = memory[k]
+                    if values[code] >= 0:
+                        memory[first + 1] = code
+                        memory[k] = false_code
+                        watches[code].extend((cref, other))
+                        break
+                else:
+                    watchers[j] = cref
+                    watchers[j + 1] = other
+                    j += 2
+                    if values[other] < 0:
+                        # Every literal is False → conflict! Keep the remaining watches.
+                        del watchers[j:i]
+                        state.propagation_head = len(trail)
+                        return cref
+                    state.assign(other, cref)
+            del watchers[j:]
+        return None
+
+    def relocate(self, relocation):
+        """
+        Rewrites the clause references after a compaction of the arena, dropping the watches of
+        the clauses that are no longer in it.
+        """
+        for watchers in self.watches:
+            j = 0
+            for i in range(0, len(watchers), 2):
+                cref = relocation.get(watchers[i])
+                if cref is not None:
+                    watchers[j] = cref
+                    watchers[j + 1] = watchers[i + 1]
+                    j += 2
+            del watchers[j:]
+        for binaries in self.binary_watches:
+            j = 0
+            for i in range(0, len(binaries), 2):
+                cref = relocation.get(binaries[i + 1])
+                if cref is not None:
+                    binaries[j] = binaries[i]
+                    binaries[j + 1] = cref
+                    j += 2
+            del binaries[j:]
@@ -0,0 +1,134 @@
+class RestartPolicy:
+    """
+    Decides when the solver restarts, i.e. backjumps to level 0 keeping its learned clauses.
+
+    The solver calls on_conflict() after learning each clause, then should_restart(), and
+    on_restart() after a restart. Every method is O(1). This base policy never restarts.
+    """
+
+    __slots__ = ()
+
+    def on_conflict(self, lbd, trail_size):
+        """
+        Parameters:
+          lbd: LBD of the clause just learned.
+          trail_size: Number of assigned literals when the conflict was found.
+        """
+
+    def should_restart(self):
+        return False
+
+    def on_restart(self):
+        pass
+
+
+class LubyRestart(RestartPolicy):
+    """
+    Restarts after unit_run * luby(i) conflicts: 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, ...
+    The sequence is generated with Knuth's reluctant doubling pair (u, v), where v is the next term.
+    """
+
+    __slots__ = ('unit_run', 'u', 'v', 'conflicts')
+
+    def __init__(self, unit_run=100):
+        self.unit_run = unit_run
+        self.u = self.v = 1
+        self.conflicts = 0  # Conflicts since the last restart.
+
+    def on_conflict(self, lbd, trail_size):
+        self.conflicts += 1
+
+    def should_restart(self):
+        return self.conflicts >= self.unit_run * self.v
+
+    def on_restart(self):
+        self.conflicts = 0
+        if self.u & -self.u == self.v:
+            self.u += 1
+            self.v = 1
+        else:
+            self.v *= 2
+
+
+class GeometricRestart(RestartPolicy):
+    """
+    Restarts after first conflicts, then after intervals growing by factor each time.
+    """
+
+    __slots__ = ('limit', 'factor', 'conflicts')
+
+    def __init__(self, first=100, factor=1.5):
+        self.limit = first
+        self.factor = factor
+        self.conflicts = 0  # Conflicts since the last restart.
+
+    def on_conflict(self, lbd, trail_size):
+        self.conflicts += 1
+
+    def should_restart(self):
+        return self.conflicts >= self.limit
+
+    def on_restart(self):
+        self.conflicts = 0
+        self.limit *= self.factor
+
+
+class MovingAverage:
+    """
+    Exponential moving average. Until 1 / alpha values have been seen it is the plain mean, so
+    the first values are not biased towards the initial 0.
+    """
+
+    __slots__ = ('value', 'alpha', 'count')
+
+    def __init__(self, alpha):
+        self.value = 0.0
+        self.alpha = alpha
+        self.count = 0
+
+    def update(self, x):
+        self.count += 1
+        self.value += max(self.alpha, 1.0 / self.count) * (x - self.value)
+
+
+class GlucoseRestart(RestartPolicy):
+    """
+    Glucose-style dynamic restarts: restart when the LBD of the recent learned clauses (fast
+    moving average) is worse than margin times the long-run average (slow moving average), that
+    is, when the search stopped producing good clauses.
+
+    A restart is blocked, by waiting at least min_conflicts more conflicts, when the trail at a
+    conflict is block_margin times longer than its long-run average: the solver may be close to
+    a model.
+    """
+
+    __slots__ = ('fast_lbd', 'slow_lbd', 'trail', 'margin', 'block_margin', 'min_conflicts', 'block_after',
+                 'conflicts', 'total_conflicts')
+
+    def __init__(self, margin=1.25, block_margin=1.4, min_conflicts=50, block_after=10000,
+                 fast_alpha=1 / 32, slow_alpha=1 / 4096, trail_alpha=1 / 4096):
+        self.fast_lbd = MovingAverage(fast_alpha)
+        self.slow_lbd = MovingAverage(slow_alpha)
+        self.trail = MovingAverage(trail_alpha)
+        self.margin = margin
+        self.block_margin = block_margin
+        self.min_conflicts = min_conflicts  # Conflicts between two restarts, at least.
+        self.block_after = block_after      # Conflicts before restarts may be blocked.
+        self.conflicts = 0                  # Conflicts since the last restart (or block).
+        self.total_conflicts = 0
+
+    def on_conflict(self, lbd, trail_size):
+        self.conflicts += 1
+        self.total_conflicts += 1
+        if (self.total_conflicts > self.block_after and self.conflicts >= self.min_conflicts and
+                trail_size > self.block_margin * self.trail.value):
+            self.conflicts = 0
+        self.trail.update(trail_size)
+        self.fast_lbd.update(lbd)
+        self.slow_lbd.update(lbd)
+
+    def should_restart(self):
+        return self.conflicts >= self.min_conflicts and self.fast_lbd.value > self.margin * self.slow_lbd.value
+
+    def on_restart(self):
+        self.conflicts = 0
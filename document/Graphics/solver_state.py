@@ -0,0 +1,99 @@
+from array import array
+
+# Literals are encoded as integer codes so that they can index flat arrays:
+# x_v -> 2v and ¬x_v -> 2v + 1. The negation of a code is code ^ 1 and its variable is code >> 1.
+
+
+def to_code(literal):
+    """
+    Converts a DIMACS literal (i or -i) into its literal code.
+    """
+    return 2 * literal if literal > 0 else 1 - 2 * literal
+
+
+def to_literal(code):
+    """
+    Converts a literal code back into a DIMACS literal.
+    """
+    return -(code >> 1) if code & 1 else code >> 1
+
+
+class SolverState:
+    """
+    Assignment state shared by the CDCL solvers: values, decision levels, reasons and the trail,
+    stored in preallocated arrays indexed by variable or by literal code.
+    """
+
+    __slots__ = ('num_vars', 'values', 'levels', 'reasons', 'trail', 'trail_lim', 'propagation_head',
+                 'decision_level')
+
+    def __init__(self, num_vars):
+        self.num_vars = num_vars
+        self.values = array('b', bytes(2 * (num_vars + 1)))  # Literal code -> 1 (True), -1 (False), 0 (unassigned).
+        self.levels = array('i', [-1]) * (num_vars + 1)     # Variable -> decision level (-1 if unassigned).
+        self.reasons = array('i', [-1]) * (num_vars + 1)     # Variable -> reference of the clause that forced it (-1 for decisions).
+        self.trail = array('i')                              # Codes of the assigned literals, in assignment order.
+        self.trail_lim = array('i')                          # Level -> trail index where level + 1 starts.
+        self.propagation_head = 0                            # Index in the trail of the next literal to propagate.
+        self.decision_level = 0
+
+    def grow(self, num_vars):
+        """
+        Makes room for the variables up to num_vars, all unassigned.
+        """
+        extra = num_vars - self.num_vars
+        if extra <= 0:
+            return
+        self.values.extend(bytes(2 * extra))
+        self.levels.extend(array('i', [-1]) * extra)
+        self.reasons.extend(array('i', [-1]) * extra)
+        self.num_vars = num_vars
+
+    def assign(self, code, reason):
+        """
+        Makes the literal True at the current decision level and pushes it on the trail.
+        """
+        var = code >> 1
+        self.values[code] = 1
+        self.values[code ^ 1] = -1
+        self.levels[var] = self.decision_level
+        self.reasons[var] = reason
+        self.trail.append(code)
+
+    def new_decision_level(self):
+        """
+        Opens a new decision level, remembering where it starts on the trail.
+        """
+        self.trail_lim.append(len(self.trail))
+        self.decision_level += 1
+
+    def backtrack(self, level):
+        """
+        Undoes every assignment made above the given decision level by truncating the trail
+        at the start of level + 1. Only the variables being unassigned are touched.
+        
+        Returns the codes of the unassigned literals, so that the decision heuristic can take
+        their variables back.
+        """
+        if self.decision_level <= level:
+            return self.trail[:0]
+        start = self.trail_lim[level]
+        undone = self.trail[start:]
+        values, levels, reasons = self.values, self.levels, self.reasons
+        for code in undone:
+            var = code >> 1
+            values[code] = values[code ^ 1] = 0
+            levels[var] = -1
+            reasons[var] = -1
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.propagation_head = start
+        self.decision_level = level
+        return undone
+
+    def model(self, variables):
+        """
+        Returns the assignment of the given variables as a dictionary variable -> True/False.
+        """
+        values = self.values
+        return {var: values[2 * var] == 1 for var in variables}
@@ -0,0 +1,109 @@
+from array import array
+
+
+class VarHeap:
+    """
+    Indexed binary max-heap of variables ordered by an external score array.
+
+    Ties are broken in favour of the smallest variable. Each variable knows its position in the
+    heap, so insertion, removal of the best variable and the repair after a score change all
+    cost O(log n).
+    """
+
+    __slots__ = ('scores', 'heap', 'positions')
+
+    def __init__(self, scores, variables=()):
+        """
+        Parameters:
+          scores: Array indexed by variable; the heap reads it but never writes it.
+          variables: Variables initially in the heap.
+        """
+        self.scores = scores
+        self.heap = array('i')
+        self.positions = array('i', [-1]) * len(scores)  # Variable -> index in heap (-1 if absent).
+        for var in variables:
+            self.insert(var)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, var):
+        return self.positions[var] >= 0
+
+    def _better(self, a, b):
+        scores = self.scores
+        return scores[a] > scores[b] or (scores[a] == scores[b] and a < b)
+
+    def _sift_up(self, i):
+        heap, positions = self.heap, self.positions
+        var = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not self._better(var, heap[parent]):
+                break
+            heap[i] = heap[parent]
+            positions[heap[i]] = i
+            i = parent
+        heap[i] = var
+        positions[var] = i
+
+    def _sift_down(self, i):
+        heap, positions = self.heap, self.positions
+        var = heap[i]
+        size = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and self._better(heap[child + 1], heap[child]):
+                child += 1
+            if not self._better(heap[child], var):
+                break
+            heap[i] = heap[child]
+            positions[heap[i]] = i
+            i = child
+        heap[i] = var
+        positions[var] = i
+
+    def grow(self, size):
+        """
+        Makes room for the variables below size; the score array must have grown already.
+        """
+        if size > len(self.positions):
+            self.positions.extend(array('i', [-1]) * (size - len(self.positions)))
+
+    def insert(self, var):
+        """
+        Adds the variable if it is not already in the heap.
+        """
+        if self.positions[var] >= 0:
+            return
+        self.heap.append(var)
+        self._sift_up(len(self.heap) - 1)
+
+    def pop(self):
+        """
+        Removes and returns the variable with the highest score.
+        """
+        heap = self.heap
+        best = heap[0]
+        last = heap.pop()
+        self.positions[best] = -1
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        return best
+
+    def increased(self, var):
+        """
+        Restores the heap order after the score of var grew.
+        """
+        if self.positions[var] >= 0:
+            self._sift_up(self.positions[var])
+
+    def decreased(self, var):
+        """
+        Restores the heap order after the score of var shrank.
+        """
+        if self.positions[var] >= 0:
+            self._sift_down(self.positions[var])
@@ -0,0 +1,374 @@
+"""
+Almacén columnar de los resultados de los experimentos (Parquet, con pyarrow).
+
+Los resultados se guardan en 'resultados_experimento/', con una partición por
+campaña al estilo Hive:
+
+    resultados_experimento/campana=<nombre>/parte-<id>.parquet
+
+Los archivos que empiezan por '_' o '.' (la bitácora de la campaña, las partes a
+medio escribir) no forman parte de los datos.
+
+Todas las partes tienen el mismo esquema fijo (ESQUEMA): identificación de la
+celda, características de la instancia, todas las estadísticas de CaDiCaL (las del
+registro JSON de '-j', ver run_experiments.leer_stats) y los tiempos del harness.
+Las columnas que falten en una fila quedan nulas y las que no están en el esquema
+se descartan; la distribución de longitudes de cláusula ('clausulas_len_<k>') se
+guarda como un mapa longitud -> fracción. La versión del esquema va en los
+metadatos de cada parte; al cambiar las columnas hay que incrementar
+VERSION_ESQUEMA.
+
+EscritorResultados acumula las filas y escribe una parte por lote (cada
+TAMANIO_LOTE filas o SEGUNDOS_LOTE segundos, y al cerrarse). Cada parte se
+escribe en un archivo temporal y se renombra, así que una caída nunca deja una
+parte a medias. Como abrir cada parte tiene un costo fijo, compactar_campana
+reúne las partes de una campaña en una sola al terminar la campaña.
+
+cargar_resultados lee una o varias campañas como un DataFrame, opcionalmente solo
+algunas columnas. Una celda (hash_cnf × combinación) puede tener varias filas en una
+campaña: las ejecuciones que no terminaron se repiten al reanudar y una caída entre
+escribir un lote y anotarlo en la bitácora repite sus celdas. Al leer queda la última
+fila escrita de cada celda; las partes se nombran por su instante de escritura para
+poder ordenarlas. importar_csv convierte el 'resultados_experimento.csv' que
+escribían las versiones anteriores de run_experiments.py en una campaña.
+"""
+
+import csv
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+DIRECTORIO_RESULTADOS = "resultados_experimento"
+
+# Incrementar al cambiar las columnas del esquema
+VERSION_ESQUEMA = 3
+
+TAMANIO_LOTE = 1000   # filas por parte
+SEGUNDOS_LOTE = 300   # escribir el lote aunque no esté lleno pasado este tiempo
+
+CELDA = [
+    ("nombre_cnf", pa.string()),
+    ("hash_cnf", pa.string()),  # SHA-256 del CNF (nulo en las filas importadas del CSV)
+    ("vsids", pa.int8()),
+    ("dlis", pa.int8()),
+    ("restart", pa.int8()),
+    ("resultado", pa.string()),
+]
+
+CARACTERISTICAS = [
+    ("num_vars", pa.int64()),
+    ("num_clausulas", pa.int64()),
+    ("densidad", pa.float64()),
+    ("tamanio_prom_clausula", pa.float64()),
+    ("vars_positivas", pa.int64()),
+    ("vars_negativas", pa.int64()),
+] + [(f"{prefijo}_{estadistica}", pa.float64())
+     for prefijo in ("grado_var", "balance_polaridad", "cvig_grado_clausula", "vig_grado")
+     for estadistica in ("media", "desv", "min", "max")] + [
+    ("frac_vars_puras", pa.float64()),
+    ("frac_horn", pa.float64()),
+    ("frac_binarias", pa.float64()),
+]
+
+PREFIJO_LONGITUDES = "clausulas_len_"
+LONGITUDES = ("clausulas_len", pa.map_(pa.int32(), pa.float64()))
+
+# Estadísticas del registro JSON de CaDiCaL 2.1.3, en su orden. Son enteras salvo
+# las de ESTADISTICAS_REALES.
+ESTADISTICAS_CADICAL = """
+    blocked blockings candidates blockres pure pureclauses chronological compacts conflicts
+    backtracked conditioned conditionings condcands condassinit condcondinit condautinit
+    condassrem condcondrem condautrem condprops covered coverings asymmetric covered_blocked
+    decisions searched eliminated elimphases elimrounds elimtried elimgates elimequivs
+    elimands elimites elimxors elimsubst elimres elimrestried ext.prop._calls
+    ext.prop._calls_propagating explained falsified ext.clause_calls
+    ext.clause_calls_learned conflicting ext.clause_calls_propagating ext.final_check fixed
+    failed probefailed transredunits probingphases probesuccess probingrounds probed hbrs
+    hbrsizes hbreds hbrsubs units binaries flushed hyper flushings instantiated instrounds
+    learned bumped recomputed promoted1 promoted2 improvedglue lucky extendbytes
+    learned_lits minimized shrunken minishrunken otfs propagations coverprops probeprops
+    searchprops transredprops vivifyprops walkprops reactivated reduced reductions
+    collections rephased rephasedbest rephasedflip rephasedinv rephasedorig rephasedrand
+    rephasedwalk rescored restarts reused reusedlevels restored restorations
+    restored_literals stabilizing restartstab reusedstab substituted decompositions subsumed
+    subsumephases subsumerounds deduplicated transreds transitive subirr subred subtried
+    subchecks subchecks2 elimotfsub elimbwsub eagersub eagertried strengthened elimotfstr
+    elimbwstr ternary phases htr3 htr2 trail_reuses levels trail_reuses_literals assumptions
+    vivified vivifications vivifychecks vivifysched vivifyunits vivifyinst vivifysubs
+    vivifystrs vivifystrirr vivifystred1 vivifystred2 vivifystred3 vivifydecs vivifyreused
+    walked flips minimum broken weakened extensions flipped
+    total_process_time_since_initialization total_real_time_since_initialization
+    maximum_resident_set_size_of_process
+""".split()
+ESTADISTICAS_REALES = {
+    "condassinit", "condcondinit", "condautinit", "condassrem", "condcondrem", "condautrem",
+    "total_process_time_since_initialization", "total_real_time_since_initialization",
+    "maximum_resident_set_size_of_process",
+}
+
+# Columnas del CSV histórico con nombres repetidos en la salida de CaDiCaL: su parser
+# se quedaba con la última línea de cada nombre, que es la de estas subestadísticas
+NOMBRES_CSV_HISTORICO = {
+    "blocked": "covered_blocked",
+    "propagating": "ext.clause_calls_propagating",
+    "literals": "trail_reuses_literals",
+}
+
+TIEMPOS = [
+    ("tiempo_limite", pa.float64()),
+    ("par2", pa.float64()),
+    ("tiempo_segundos", pa.float64()),
+]
+
+ESQUEMA = pa.schema(
+    [pa.field(nombre, tipo) for nombre, tipo in CELDA + CARACTERISTICAS]
+    + [pa.field(*LONGITUDES)]
+    + [pa.field(nombre, pa.float64() if nombre in ESTADISTICAS_REALES else pa.int64())
+       for nombre in ESTADISTICAS_CADICAL]
+    + [pa.field(nombre, tipo) for nombre, tipo in TIEMPOS],
+    metadata={"version_esquema": str(VERSION_ESQUEMA)},
+)
+
+# Esquema al leer: el de las partes más la columna de la partición
+ESQUEMA_DATASET = ESQUEMA.append(pa.field("campana", pa.string()))
+
+# Columnas que identifican una celda de una campaña
+CLAVE_CELDA = ["campana", "hash_cnf", "vsids", "dlis", "restart"]
+
+
+def directorio_campana(campana, directorio=DIRECTORIO_RESULTADOS):
+    if not campana or "/" in campana or os.sep in campana or campana.startswith((".", "_")):
+        raise ValueError(f"Nombre de campaña no válido: '{campana}'")
+    return os.path.join(directorio, f"campana={campana}")
+
+
+def _convertir(valor, tipo):
+    """Valor de una fila (número, texto del CSV o None) -> valor Python del tipo de la columna."""
+    if valor is None or valor == "":
+        return None
+    if pa.types.is_integer(tipo):
+        return int(float(valor))
+    if pa.types.is_floating(tipo):
+        return float(valor)
+    return str(valor)
+
+
+def tabla_de_filas(filas):
+    """Convierte filas (diccionarios de construir_fila) en una tabla con ESQUEMA."""
+    columnas = []
+    for campo in ESQUEMA:
+        if campo.name == LONGITUDES[0]:
+            valores = [[(int(clave[len(PREFIJO_LONGITUDES):]), float(valor))
+                        for clave, valor in fila.items()
+                        if clave.startswith(PREFIJO_LONGITUDES) and valor not in (None, "")]
+                       for fila in filas]
+        else:
+            valores = [_convertir(fila.get(campo.name), campo.type) for fila in filas]
+        columnas.append(pa.array(valores, type=campo.type))
+    return pa.Table.from_arrays(columnas, schema=ESQUEMA)
+
+
+def _version(metadatos):
+    return (metadatos or {}).get(b"version_esquema", b"").decode()
+
+
+def _reemplazadas(metadatos):
+    """Partes que reemplaza una parte compactada (ver compactar_campana)."""
+    return set(json.loads((metadatos or {}).get(b"reemplaza", b"[]")))
+
+
+def _escribir_parte(directorio, tabla):
+    os.makedirs(directorio, exist_ok=True)
+    nombre = f"parte-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{uuid.uuid4().hex[:8]}.parquet"
+    temporal = os.path.join(directorio, "." + nombre)
+    with open(temporal, 'wb') as f:
+        pq.write_table(tabla, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, os.path.join(directorio, nombre))
+    return nombre
+
+
+class EscritorResultados:
+    """
+    Escribe las filas de una campaña por lotes. Se usa como contexto: al salir (también
+    por una excepción o Ctrl+C) se escribe el lote pendiente.
+
+    al_guardar(celdas) se llama después de que cada lote esté en disco, con los pares
+    (clave, fila) que se agregaron con clave; run_experiments.py los anota entonces en
+    la bitácora, así una celda anotada nunca se pierde.
+    """
+
+    def __init__(self, campana, directorio=DIRECTORIO_RESULTADOS, al_guardar=None,
+                 tamanio_lote=TAMANIO_LOTE, segundos_lote=SEGUNDOS_LOTE):
+        self.directorio = directorio_campana(campana, directorio)
+        self.al_guardar = al_guardar
+        self.tamanio_lote = tamanio_lote
+        self.segundos_lote = segundos_lote
+        self.filas = []
+        self.celdas = []
+        self.inicio_lote = time.time()
+
+    def agregar(self, fila, clave=None):
+        if not self.filas:
+            self.inicio_lote = time.time()
+        self.filas.append(fila)
+        if clave is not None:
+            self.celdas.append((clave, fila))
+        if (len(self.filas) >= self.tamanio_lote
+                or time.time() - self.inicio_lote >= self.segundos_lote):
+            self.vaciar()
+
+    def vaciar(self):
+        """Escribe el lote pendiente como una parte nueva."""
+        if not self.filas:
+            return
+        _escribir_parte(self.directorio, tabla_de_filas(self.filas))
+        celdas = self.celdas
+        self.filas = []
+        self.celdas = []
+        if self.al_guardar and celdas:
+            self.al_guardar(celdas)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.vaciar()
+
+
+def compactar_campana(campana, directorio=DIRECTORIO_RESULTADOS):
+    """
+    Reúne todas las partes de la campaña en una sola y borra las demás.
+
+    La parte nueva guarda en sus metadatos los nombres de las que reemplaza: si una
+    caída impide borrarlas, cargar_resultados las ignora y la siguiente compactación
+    las borra.
+    """
+    dir_campana = directorio_campana(campana, directorio)
+    if not os.path.isdir(dir_campana):
+        return
+    partes = sorted(nombre for nombre in os.listdir(dir_campana)
+                    if nombre.endswith(".parquet") and not nombre.startswith((".", "_")))
+    metadatos = {nombre: pq.read_schema(os.path.join(dir_campana, nombre)).metadata for nombre in partes}
+    sobrantes = set().union(*map(_reemplazadas, metadatos.values())) & set(partes)
+    vigentes = [nombre for nombre in partes if nombre not in sobrantes]
+    if len(vigentes) > 1:
+        tabla = pa.concat_tables(pq.read_table(os.path.join(dir_campana, nombre), schema=ESQUEMA)
+                                 for nombre in vigentes)
+        _escribir_parte(dir_campana, tabla.replace_schema_metadata(
+            {**ESQUEMA.metadata, b"reemplaza": json.dumps(vigentes)}))
+        sobrantes.update(vigentes)
+    for nombre in sobrantes:
+        os.remove(os.path.join(dir_campana, nombre))
+
+
+def cargar_resultados(directorio=DIRECTORIO_RESULTADOS, campanas=None, columnas=None):
+    """
+    Devuelve los resultados como un DataFrame de pandas, con la columna 'campana'.
+
+    campanas limita la lectura a esas campañas (por defecto, todas) y columnas a esas
+    columnas: el resto ni se lee del disco.
+    """
+    if not os.path.isdir(directorio):
+        tabla = ESQUEMA_DATASET.empty_table()
+        return (tabla.select(columnas) if columnas else tabla).to_pandas()
+    dataset = ds.dataset(directorio, schema=ESQUEMA_DATASET, format="parquet", partitioning="hive")
+    filtro = ds.field("campana").isin(list(campanas)) if campanas else None
+    fragmentos = list(dataset.get_fragments(filter=filtro))
+    reemplazadas = set()
+    for fragmento in fragmentos:
+        metadatos = fragmento.physical_schema.metadata
+        if _version(metadatos) != str(VERSION_ESQUEMA):
+            raise ValueError(f"'{fragmento.path}' tiene la versión '{_version(metadatos)}' del esquema "
+                             f"y se esperaba la {VERSION_ESQUEMA}")
+        directorio_fragmento = os.path.dirname(fragmento.path)
+        reemplazadas.update(os.path.join(directorio_fragmento, nombre) for nombre in _reemplazadas(metadatos))
+    # Partes ya compactadas que una caída dejó sin borrar; el resto, en orden de escritura
+    fragmentos = sorted((fragmento for fragmento in fragmentos if fragmento.path not in reemplazadas),
+                        key=lambda fragmento: fragmento.path)
+    dataset = ds.FileSystemDataset(fragmentos, ESQUEMA_DATASET, dataset.format, dataset.filesystem)
+    lectura = list(dict.fromkeys(list(columnas) + CLAVE_CELDA)) if columnas else None
+    df = dataset.to_table(columns=lectura, filter=filtro).to_pandas()
+    # Última fila de cada celda; las filas sin hash (importadas del CSV) no se agrupan
+    repetidas = df["hash_cnf"].notna() & df.duplicated(CLAVE_CELDA, keep="last")
+    df = df[~repetidas].reset_index(drop=True)
+    return df[list(columnas)] if columnas else df
+
+
+def _cabecera_de_fila(cabecera, fila):
+    """
+    Columnas con que se escribió una fila del CSV histórico limpiado a una sola cabecera.
+
+    Cada fila se escribía con sus propias columnas: las de la celda y las
+    características, una 'clausulas_len_<k>' por longitud presente, las estadísticas de
+    CaDiCaL (solo si las hubo) y 'tiempo_segundos'; las filas solo coinciden con la
+    cabecera que quedó si tienen sus mismas longitudes. El número de campos no vacíos
+    dice cuántas longitudes y si hay estadísticas. Las longitudes se nombran con las de
+    la cabecera si reproducen el tamaño medio de cláusula de la fila, o con ese tamaño
+    medio si hay una sola; si no, quedan sin nombre (None) y no se importan.
+    """
+    longitudes = [nombre for nombre in cabecera if nombre.startswith(PREFIJO_LONGITUDES)]
+    base = cabecera[:cabecera.index(longitudes[0])] if longitudes else cabecera[:cabecera.index("tiempo_segundos")]
+    inicio_estadisticas = cabecera.index(longitudes[-1]) + 1 if longitudes else len(base)
+    estadisticas = cabecera[inicio_estadisticas:cabecera.index("tiempo_segundos")]
+
+    campos = len(fila)
+    while campos and fila[campos - 1] == "":
+        campos -= 1
+    num_longitudes = campos - len(base) - 1 - len(estadisticas)
+    if num_longitudes < 1:  # Sin estadísticas (TIMEOUT)
+        estadisticas = []
+        num_longitudes = campos - len(base) - 1
+
+    fila_base = dict(zip(base, fila))
+    fracciones = [float(valor) for valor in fila[len(base):len(base) + num_longitudes]]
+    try:
+        tamanio_medio = float(fila_base.get("tamanio_prom_clausula"))
+    except (TypeError, ValueError):
+        tamanio_medio = None
+    nombres_longitudes = [None] * num_longitudes
+    if tamanio_medio is not None:
+        if num_longitudes == len(longitudes) and abs(sum(
+                f * int(nombre[len(PREFIJO_LONGITUDES):]) for f, nombre in zip(fracciones, longitudes))
+                - tamanio_medio) < 1e-6:
+            nombres_longitudes = longitudes
+        elif num_longitudes == 1 and tamanio_medio.is_integer():
+            nombres_longitudes = [f"{PREFIJO_LONGITUDES}{int(tamanio_medio)}"]
+    return base + nombres_longitudes + estadisticas + ["tiempo_segundos"]
+
+
+def importar_csv(path_csv, campana, directorio=DIRECTORIO_RESULTADOS):
+    """
+    Importa como campaña el CSV que escribían las versiones anteriores de
+    run_experiments.py y devuelve el número de filas importadas.
+
+    Ese CSV tiene una cabecera antes de cada fila con las columnas de esa fila, y así
+    se lee cada fila. Si se limpió dejando una sola cabecera, las columnas de cada fila
+    se reconstruyen con _cabecera_de_fila. Las columnas de NOMBRES_CSV_HISTORICO se
+    guardan con el nombre de la subestadística que contienen.
+    """
+    filas = []
+    cabecera = None
+    propia = False  # La fila anterior es la cabecera de esta fila
+    with open(path_csv, newline='') as f:
+        for fila in csv.reader(f):
+            if not fila:
+                continue
+            if fila[0] == "nombre_cnf":
+                cabecera = fila
+                propia = True
+            elif cabecera is not None:
+                columnas = cabecera if propia else _cabecera_de_fila(cabecera, fila)
+                filas.append({NOMBRES_CSV_HISTORICO.get(nombre, nombre): valor
+                              for nombre, valor in zip(columnas, fila) if nombre})
+                propia = False
+    if filas:
+        _escribir_parte(directorio_campana(campana, directorio), tabla_de_filas(filas))
+    return len(filas)
@@ -146,6 +146,8 @@ void App::print_usage (bool all) {
         "\n"
         "  -o <output>    write simplified CNF in DIMACS format to file\n"
         "  -e <extend>    write reconstruction/extension stack to file\n"
+        "  -j <fd>        write statistics and resource usage as one JSON\n"
+        "                 object to the open file descriptor '<fd>'\n"
 #ifdef LOGGING
         "  -l             enable logging messages (same as '--log')\n"
 #endif
@@ -373,7 +375,8 @@ int App::main (int argc, char **argv) {
   bool proof_specified = false, dimacs_specified = false;
   int optimize = 0, preprocessing = 0, localsearch = 0;
   const char *output_path = 0, *extension_path = 0;
-  int conflict_limit = -1, decision_limit = -1;
+  int conflict_limit = -1, decision_limit = -1, json_stats_fd = -1;
+  FILE *json_stats_file = 0;
   const char *conflict_limit_specified = 0;
   const char *decision_limit_specified = 0;
   const char *localsearch_specified = 0;
@@ -490,6 +493,17 @@ int App::main (int argc, char **argv) {
         APPERR ("invalid decision limit");
       else
         decision_limit_specified = argv[i];
+    } else if (!strcmp (argv[i], "-j")) {
+      if (++i == argc)
+        APPERR ("argument to '-j' missing");
+      else if (json_stats_file)
+        APPERR ("multiple statistics file descriptors '-j %d' and '-j %s'",
+                json_stats_fd, argv[i]);
+      else if (!parse_int_str (argv[i], json_stats_fd) || json_stats_fd < 0)
+        APPERR ("invalid argument in '-j %s'", argv[i]);
+      else if (!(json_stats_file = fdopen (json_stats_fd, "w")))
+        APPERR ("can not write statistics to file descriptor %d",
+                json_stats_fd);
     }
 #ifndef __WIN32
     else if (!strcmp (argv[i], "-t")) {
@@ -903,6 +917,10 @@ int App::main (int argc, char **argv) {
     fclose (write_result_file);
   solver->statistics ();
   solver->resources ();
+  if (json_stats_file) {
+    solver->json_statistics (json_stats_file);
+    fclose (json_stats_file);
+  }
   solver->section ("shutting down");
   solver->message ("exit %d", res);
   if (less_pipe) {
@@ -863,6 +863,13 @@ public:
   void statistics (); // print statistics
   void resources ();  // print resource usage (time and memory)
 
+  // Write statistics and resource usage as one JSON object to 'file'.
+  //
+  //   require (!DELETING)
+  //   ensure (!DELETING)
+  //
+  void json_statistics (FILE *file);
+
   //   require (VALID)
   //   ensure (VALID)
   //
@@ -1425,7 +1425,8 @@ struct Internal {
   void report_solving (int);
 
   void print_statistics ();
-  void print_resource_usage ();
+  void print_resource_usage (FILE *json = 0);
+  void print_json_statistics (FILE *);
 
   /*----------------------------------------------------------------------*/
 
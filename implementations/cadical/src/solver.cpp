@@ -1339,6 +1339,15 @@ void Solver::resources () {
   LOG_API_CALL_END ("resources");
 }
 
+void Solver::json_statistics (FILE *file) {
+  if (state () == DELETING)
+    return;
+  LOG_API_CALL_BEGIN ("json_statistics");
+  REQUIRE_VALID_OR_SOLVING_STATE ();
+  internal->print_json_statistics (file);
+  LOG_API_CALL_END ("json_statistics");
+}
+
 /*------------------------------------------------------------------------*/
 
 const char *Solver::read_dimacs (File *file, int &vars, int strict,
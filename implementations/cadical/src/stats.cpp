@@ -2,6 +2,8 @@
 
 #include "internal.hpp"
 
+#include <cstdarg>
+
 namespace CaDiCaL {
 
 /*------------------------------------------------------------------------*/
@@ -15,30 +17,96 @@ Stats::Stats () {
 
 /*------------------------------------------------------------------------*/
 
+// Statistics can also be written as members of a JSON object (see
+// 'Internal::print_json_statistics').  Each line 'name: number ...' becomes
+// the member '"name":number' with the name in lower case and its spaces
+// replaced by '_'.  Only the first number of the line is kept, which is
+// an integer unless printed with a fraction.  Numbers which are not finite
+// are written as 'null'.  A few sub-statistics (indented lines) share their
+// name with another line, like 'literals' of both 'restored' and 'trail
+// reuses', and are prefixed with the name of their section instead
+// ('restored_literals'), so that all members have different names.
+
+#define JSON_NAME_SIZE 64
+
+static const char *json_repeated_names[] = {"blocked", "learned",
+                                            "literals", "propagating"};
+
+static void json_member (FILE *file, char *section, const char *fmt, ...) {
+  char line[256];
+  va_list ap;
+  va_start (ap, fmt);
+  vsnprintf (line, sizeof line, fmt, ap);
+  va_end (ap);
+  const char *colon = strchr (line, ':');
+  if (!colon)
+    return;
+  const char *p = line;
+  const bool sub = (*p == ' ');
+  while (*p == ' ')
+    p++;
+  char name[JSON_NAME_SIZE];
+  size_t size = 0;
+  for (; p < colon && size + 1 < sizeof name; p++)
+    name[size++] = *p == ' ' ? '_' : tolower ((unsigned char) *p);
+  name[size] = 0;
+  fputs (",\"", file);
+  if (!sub)
+    strcpy (section, name);
+  else
+    for (const char *repeated : json_repeated_names)
+      if (!strcmp (name, repeated)) {
+        fprintf (file, "%s_", section);
+        break;
+      }
+  fputs (name, file);
+  fputs ("\":", file);
+  const char *number = colon + 1;
+  while (*number == ' ')
+    number++;
+  char *end;
+  const double value = strtod (number, &end);
+  if (end == number || !std::isfinite (value))
+    fputs ("null", file);
+  else
+    fwrite (number, 1, end - number, file);
+}
+
+#define RES(FMT, ...) \
+  do { \
+    if (json) \
+      json_member (json, json_section, FMT, __VA_ARGS__); \
+    else \
+      MSG (FMT, __VA_ARGS__); \
+  } while (0)
+
 #define PRT(FMT, ...) \
   do { \
     if (FMT[0] == ' ' && !all) \
       break; \
-    MSG (FMT, __VA_ARGS__); \
+    RES (FMT, __VA_ARGS__); \
   } while (0)
 
 /*------------------------------------------------------------------------*/
 
-void Stats::print (Internal *internal) {
+void Stats::print (Internal *internal, FILE *json) {
 
 #ifdef QUIET
   (void) internal;
+  (void) json;
 #else
 
   Stats &stats = internal->stats;
+  char json_section[JSON_NAME_SIZE] = "";
 
-  int all = internal->opts.verbose > 0 || internal->opts.stats;
+  // The JSON object always has all members.
+  int all = json || internal->opts.verbose > 0 || internal->opts.stats;
 #ifdef LOGGING
   if (internal->opts.log)
     all = true;
 #endif // ifdef LOGGING
 
-  if (internal->opts.profile)
+  if (!json && internal->opts.profile)
     internal->print_profile ();
 
   double t = internal->solve_time ();
@@ -56,7 +124,8 @@ void Stats::print (Internal *internal) {
   size_t extendbytes = internal->external->extension.size ();
   extendbytes *= sizeof (int);
 
-  SECTION ("statistics");
+  if (!json)
+    SECTION ("statistics");
 
   if (all || stats.blocked) {
     PRT ("blocked:         %15" PRId64
@@ -540,6 +609,9 @@ void Stats::print (Internal *internal) {
          stats.extended, relative (stats.extended, stats.weakened));
   }
 
+  if (json)
+    return;
+
   LINE ();
   MSG ("%sseconds are measured in %s time for solving%s",
        tout.magenta_code (), internal->opts.realtime ? "real" : "process",
@@ -548,19 +620,35 @@ void Stats::print (Internal *internal) {
 #endif // ifndef QUIET
 }
 
-void Internal::print_resource_usage () {
+void Internal::print_resource_usage (FILE *json) {
 #ifndef QUIET
-  SECTION ("resources");
+  if (!json)
+    SECTION ("resources");
   uint64_t m = maximum_resident_set_size ();
-  MSG ("total process time since initialization: %12.2f    seconds",
+  char json_section[JSON_NAME_SIZE] = "";
+  RES ("total process time since initialization: %12.2f    seconds",
        internal->process_time ());
-  MSG ("total real time since initialization:    %12.2f    seconds",
+  RES ("total real time since initialization:    %12.2f    seconds",
        internal->real_time ());
-  MSG ("maximum resident set size of process:    %12.2f    MB",
+  RES ("maximum resident set size of process:    %12.2f    MB",
        m / (double) (1l << 20));
+#else
+  (void) json;
 #endif
 }
 
+// Statistics and resource usage as one JSON object on a single line, also
+// with '--quiet'.  The first member is the version of the solver, which is
+// the only one if messages are not compiled in ('QUIET').
+
+void Internal::print_json_statistics (FILE *file) {
+  fprintf (file, "{\"version\":\"%s\"", version ());
+  stats.print (this, file);
+  print_resource_usage (file);
+  fputs ("}\n", file);
+  fflush (file);
+}
+
 /*------------------------------------------------------------------------*/
 
 void Checker::print_stats () {
@@ -1,6 +1,7 @@
 #ifndef _stats_hpp_INCLUDED
 #define _stats_hpp_INCLUDED
 
+#include <cstdio>
 #include <cstdlib>
 
 namespace CaDiCaL {
@@ -261,7 +262,7 @@ struct Stats {
 
   Stats ();
 
-  void print (Internal *);
+  void print (Internal *, FILE *json = 0);
 };
 
 /*------------------------------------------------------------------------*/
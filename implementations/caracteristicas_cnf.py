@@ -0,0 +1,328 @@
+"""
+Extracción de características estructurales de instancias CNF (formato DIMACS).
+
+El archivo se lee en bloques grandes y se tokeniza por bloque, sin construir una
+lista por cláusula: la memoria usada es constante salvo los conjuntos de
+variables vistas. Acepta CNFs comprimidos con gzip, xz o bzip2 (se detectan por
+su cabecera, no por la extensión). La lectura es la de document/Graphics/dimacs.py,
+compartida con los solvers Python.
+
+extraer_caracteristicas_numpy carga la fórmula completa en un arreglo plano de
+literales (int32) más un arreglo de offsets por cláusula y, con operaciones
+vectorizadas, calcula además estadísticas de grado de variables, balance de
+polaridad, momentos de grado de los grafos VIG/CVIG y fracciones de cláusulas
+Horn y binarias.
+
+Las características se guardan en una caché en disco direccionada por contenido
+(hash del archivo + versión del extractor), junto a 'generated_benchmarks/'. Así
+solo se calculan una vez por instancia y el notebook las reutiliza.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# El lector de DIMACS (descompresión y lectura por bloques) es el de los solvers Python del documento
+DIR_SOLVERS_PYTHON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "document", "Graphics")
+if DIR_SOLVERS_PYTHON not in sys.path:
+    sys.path.append(DIR_SOLVERS_PYTHON)
+from dimacs import read_blocks
+
+# Incrementar al cambiar las características que devuelve el extractor
+VERSION_EXTRACTOR = 2
+NOMBRE_DIR_CACHE = "cache_caracteristicas"
+
+
+def _es_linea_especial(linea):
+    return linea[:1] in (b"c", b"p", b"%")
+
+
+def _tiene_lineas_especiales(bloque):
+    return (_es_linea_especial(bloque)
+            or b"\nc" in bloque or b"\np" in bloque or b"\n%" in bloque)
+
+
+def bloques_de_clausulas(path, cabecera):
+    """
+    Genera bloques de bytes que solo contienen los enteros de las cláusulas (con
+    sus ceros terminales), sin comentarios ni cabecera. Al leer la línea 'p cnf'
+    guarda en 'cabecera' las claves 'num_vars' y 'num_clausulas'.
+    """
+    for bloque in read_blocks(path):
+        fin_formula = False
+        if _tiene_lineas_especiales(bloque):
+            # Camino lento (poco frecuente): separar comentarios y cabecera
+            lineas = []
+            for linea in bloque.splitlines():
+                linea = linea.strip()
+                if linea.startswith(b"%"):
+                    fin_formula = True  # marcador de fin usado en SATLIB
+                    break
+                if linea.startswith(b"p"):
+                    partes = linea.split()
+                    if len(partes) >= 4:
+                        cabecera["num_vars"] = int(partes[2])
+                        cabecera["num_clausulas"] = int(partes[3])
+                    continue
+                if not linea.startswith(b"c"):
+                    lineas.append(linea)
+            bloque = b" ".join(lineas)
+
+        yield bloque
+
+        if fin_formula:
+            break
+
+
+def extraer_caracteristicas_cnf(path):
+    cabecera = {"num_vars": 0, "num_clausulas": 0}
+    clausulas_leidas = 0
+    total_literales = 0
+    longitudes = {}       # longitud de cláusula -> cantidad (en orden de aparición)
+    pendiente = 0         # literales de una cláusula que continúa en el bloque siguiente
+    positivos = set()
+    negativos = set()
+
+    for bloque in bloques_de_clausulas(path, cabecera):
+        numeros = list(map(int, bloque.split()))
+        positivos.update(filter((0).__lt__, numeros))
+        negativos.update(filter((0).__gt__, numeros))
+
+        # Las longitudes salen de la distancia entre ceros consecutivos
+        inicio = 0
+        while True:
+            try:
+                fin = numeros.index(0, inicio)
+            except ValueError:
+                break
+            largo = pendiente + fin - inicio
+            pendiente = 0
+            longitudes[largo] = longitudes.get(largo, 0) + 1
+            total_literales += largo
+            clausulas_leidas += 1
+            inicio = fin + 1
+        pendiente += len(numeros) - inicio
+
+    if pendiente:
+        # Última cláusula sin el 0 final
+        longitudes[pendiente] = longitudes.get(pendiente, 0) + 1
+        total_literales += pendiente
+        clausulas_leidas += 1
+
+    num_vars = cabecera["num_vars"]
+    num_clausulas = cabecera["num_clausulas"]
+    densidad = num_clausulas / num_vars if num_vars else 0
+    tamanio_prom_clausula = total_literales / clausulas_leidas if clausulas_leidas else 0
+    dist_longitudes = {f"clausulas_len_{k}": v / num_clausulas for k, v in longitudes.items()}
+
+    return {
+        "num_vars": num_vars,
+        "num_clausulas": num_clausulas,
+        "densidad": densidad,
+        "tamanio_prom_clausula": tamanio_prom_clausula,
+        "vars_positivas": len(positivos),
+        "vars_negativas": len(negativos),
+        **dist_longitudes
+    }
+
+
+# ====================================================
+#         EXTRACCIÓN VECTORIZADA CON NUMPY
+# ====================================================
+
+def cargar_formula_numpy(path):
+    """
+    Carga un CNF como (num_vars, num_clausulas, literales, offsets): 'literales'
+    es un arreglo int32 plano sin ceros y la cláusula i ocupa
+    literales[offsets[i]:offsets[i + 1]]. num_vars y num_clausulas son los de
+    la cabecera 'p cnf'.
+    """
+    cabecera = {"num_vars": 0, "num_clausulas": 0}
+    partes = [np.fromstring(bloque, dtype=np.int32, sep=" ")
+              for bloque in bloques_de_clausulas(path, cabecera)]
+    tokens = np.concatenate(partes) if partes else np.zeros(0, dtype=np.int32)
+
+    ceros = np.flatnonzero(tokens == 0)
+    # La cláusula i termina en ceros[i]; restando i se obtiene su fin en 'literales'
+    fines = ceros - np.arange(len(ceros))
+    literales = tokens[tokens != 0]
+    if len(literales) > (fines[-1] if len(fines) else 0):
+        # Última cláusula sin el 0 final
+        fines = np.append(fines, len(literales))
+    offsets = np.concatenate(([0], fines)).astype(np.int64)
+    return cabecera["num_vars"], cabecera["num_clausulas"], literales, offsets
+
+
+def _estadisticas(prefijo, valores):
+    if len(valores) == 0:
+        return {f"{prefijo}_{k}": 0.0 for k in ("media", "desv", "min", "max")}
+    return {
+        f"{prefijo}_media": float(valores.mean()),
+        f"{prefijo}_desv": float(valores.std()),
+        f"{prefijo}_min": float(valores.min()),
+        f"{prefijo}_max": float(valores.max()),
+    }
+
+
+def _grados_vig(variables, offsets, longitudes, n):
+    """
+    Grado de cada variable en el grafo de interacción de variables (VIG): número
+    de variables distintas con las que comparte alguna cláusula. Se generan todos
+    los pares (u, w) de cada cláusula (memoria proporcional a la suma de k²).
+    """
+    repeticiones = np.repeat(longitudes, longitudes)
+    u = np.repeat(variables, repeticiones)
+    # Para cada ocurrencia, los índices de todos los literales de su cláusula
+    inicio_clausula = np.repeat(np.repeat(offsets[:-1], longitudes), repeticiones)
+    desplazamiento = np.arange(len(u)) - np.repeat(np.cumsum(repeticiones) - repeticiones, repeticiones)
+    w = variables[inicio_clausula + desplazamiento]
+
+    distintos = u != w
+    aristas = u[distintos].astype(np.int64) * (n + 1) + w[distintos]
+    # Deduplicar ordenando: mucho más rápido que np.unique (por hash) en arreglos grandes
+    aristas.sort()
+    if len(aristas):
+        aristas = aristas[np.concatenate(([True], aristas[1:] != aristas[:-1]))]
+    return np.bincount(aristas // (n + 1), minlength=n + 1)[1:]
+
+
+def extraer_caracteristicas_numpy(path):
+    num_vars, num_clausulas, literales, offsets = cargar_formula_numpy(path)
+    longitudes = np.diff(offsets)
+    m = len(longitudes)
+    variables = np.abs(literales)
+    n = max(num_vars, int(variables.max()) if len(variables) else 0)
+
+    # --- características originales (mismos valores que extraer_caracteristicas_cnf)
+    densidad = num_clausulas / num_vars if num_vars else 0
+    tamanio_prom_clausula = len(literales) / m if m else 0
+    valores_len, primera_aparicion, cuentas_len = np.unique(
+        longitudes, return_index=True, return_counts=True)
+    orden = np.argsort(primera_aparicion)
+    dist_longitudes = {f"clausulas_len_{int(valores_len[i])}": int(cuentas_len[i]) / num_clausulas
+                       for i in orden}
+
+    positivos = np.bincount(literales[literales > 0], minlength=n + 1)[1:]
+    negativos = np.bincount(-literales[literales < 0], minlength=n + 1)[1:]
+
+    # --- grado de las variables (nodos variable del CVIG) y polaridad
+    grado = positivos + negativos
+    presentes = grado > 0
+    balance = np.abs(positivos - negativos)[presentes] / grado[presentes]
+
+    # --- cláusulas Horn (a lo sumo un literal positivo) y binarias
+    id_clausula = np.repeat(np.arange(m), longitudes)
+    positivos_por_clausula = np.bincount(id_clausula[literales > 0], minlength=m)
+
+    vig = _grados_vig(variables, offsets, longitudes, n)
+
+    return {
+        "num_vars": num_vars,
+        "num_clausulas": num_clausulas,
+        "densidad": densidad,
+        "tamanio_prom_clausula": tamanio_prom_clausula,
+        "vars_positivas": int(np.count_nonzero(positivos)),
+        "vars_negativas": int(np.count_nonzero(negativos)),
+        **dist_longitudes,
+        **_estadisticas("grado_var", grado[presentes]),
+        **_estadisticas("balance_polaridad", balance),
+        "frac_vars_puras": float(np.mean(balance == 1)) if len(balance) else 0.0,
+        **_estadisticas("cvig_grado_clausula", longitudes),
+        **_estadisticas("vig_grado", vig[presentes]),
+        "frac_horn": float(np.mean(positivos_por_clausula <= 1)) if m else 0.0,
+        "frac_binarias": float(np.mean(longitudes == 2)) if m else 0.0,
+    }
+
+
+# ====================================================
+#         CACHÉ DE CARACTERÍSTICAS POR CONTENIDO
+# ====================================================
+
+def hash_instancia(path):
+    """SHA-256 del contenido del CNF: identifica la instancia aunque cambie de nombre."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def directorio_cache(input_dir):
+    """Carpeta de la caché, hermana de la carpeta de benchmarks."""
+    padre = os.path.dirname(os.path.abspath(input_dir))
+    return os.path.join(padre, NOMBRE_DIR_CACHE)
+
+
+def _path_entrada(dir_cache, hash_cnf):
+    return os.path.join(dir_cache, f"{hash_cnf}-v{VERSION_EXTRACTOR}.json")
+
+
+def _leer_entrada(dir_cache, hash_cnf):
+    try:
+        with open(_path_entrada(dir_cache, hash_cnf), 'r') as f:
+            return json.load(f)["caracteristicas"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _guardar_entrada(dir_cache, hash_cnf, path_cnf, caracteristicas):
+    os.makedirs(dir_cache, exist_ok=True)
+    destino = _path_entrada(dir_cache, hash_cnf)
+    entrada = {
+        "hash": hash_cnf,
+        "version": VERSION_EXTRACTOR,
+        "nombre_cnf": os.path.basename(path_cnf),
+        "caracteristicas": caracteristicas,
+    }
+    # Escritura atómica: un lector nunca ve una entrada a medio escribir
+    temporal = f"{destino}.{os.getpid()}.tmp"
+    with open(temporal, 'w') as f:
+        json.dump(entrada, f)
+    os.replace(temporal, destino)
+
+
+def obtener_caracteristicas(hashes, dir_cache, jobs=None):
+    """
+    Devuelve {path: características} para cada path de 'hashes' ({path: hash}).
+    Las instancias que no están en la caché se procesan en paralelo y se guardan.
+    """
+    resultado = {}
+    faltantes = []
+    for path, hash_cnf in hashes.items():
+        caracteristicas = _leer_entrada(dir_cache, hash_cnf)
+        if caracteristicas is None:
+            faltantes.append(path)
+        else:
+            resultado[path] = caracteristicas
+
+    if faltantes:
+        print(f"🔎 Calculando características de {len(faltantes)} instancias...")
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            calculadas = pool.map(extraer_caracteristicas_numpy, faltantes)
+            for path, caracteristicas in zip(faltantes, calculadas):
+                _guardar_entrada(dir_cache, hashes[path], path, caracteristicas)
+                resultado[path] = caracteristicas
+    return resultado
+
+
+def cargar_cache_caracteristicas(dir_cache):
+    """
+    Lee todas las entradas de la versión actual del extractor como una lista de
+    filas {'nombre_cnf', 'hash', ...características}, lista para pd.DataFrame.
+    """
+    filas = []
+    if not os.path.isdir(dir_cache):
+        return filas
+    sufijo = f"-v{VERSION_EXTRACTOR}.json"
+    for nombre in sorted(os.listdir(dir_cache)):
+        if not nombre.endswith(sufijo):
+            continue
+        with open(os.path.join(dir_cache, nombre), 'r') as f:
+            entrada = json.load(f)
+        filas.append({"nombre_cnf": entrada["nombre_cnf"], "hash": entrada["hash"],
+                      **entrada["caracteristicas"]})
+    return filas
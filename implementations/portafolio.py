@@ -0,0 +1,241 @@
+"""
+Modo portafolio: resuelve una instancia CNF lanzando a la vez todas las combinaciones
+de heurísticas y quedándose con el primer veredicto.
+
+Cada combinación de COMBINACIONES corre en su propio proceso, fijado a su propio
+núcleo. Puede ser CaDiCaL con los flags de construir_flags (motor 'cadical') o el
+solver Python equivalente de document/Graphics (motor 'python'). Cada proceso se
+detiene por sí mismo al agotar el límite de tiempo (-t de CaDiCaL, una alarma en los
+solvers Python). En cuanto uno responde SAT o UNSAT se matan los demás.
+
+La combinación ganadora de cada instancia se anota en 'ganadores_portafolio.jsonl'
+(hash de la instancia, motor, combinación, resultado y tiempo), para alimentar la
+selección de configuración.
+
+Uso:
+    python3 portafolio.py [archivos CNF...] [--motor cadical|python]
+Sin archivos, se resuelven todas las instancias de INPUT_DIR.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import tempfile
+import threading
+import time
+
+from caracteristicas_cnf import DIR_SOLVERS_PYTHON, hash_instancia
+from run_experiments import (COMBINACIONES, EXTENSIONES_CNF, INPUT_DIR, TIEMPO_LIMITE, VEREDICTOS, construir_flags,
+                             lanzar_cadical, leer_stats, nucleos_fisicos)
+
+GANADORES = "ganadores_portafolio.jsonl"
+
+
+def _fijar_nucleo(pid, nucleo):
+    if nucleo is not None and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(pid, {nucleo})
+        except OSError:
+            pass
+
+
+# ====================================================
+#                  MOTOR CADICAL
+# ====================================================
+
+def _esperar_cadical(indice, proceso, archivo_stats, respuestas):
+    with archivo_stats:
+        proceso.communicate()
+        respuestas.put((indice, proceso.returncode, leer_stats(archivo_stats, proceso.returncode)))
+
+
+def _lanzar_cadical(path_cnf, combinaciones, nucleos, respuestas, tiempo_limite):
+    procesos = []
+    for indice, comb in enumerate(combinaciones):
+        archivo_stats = tempfile.TemporaryFile(mode='w+')
+        proceso = lanzar_cadical(path_cnf, construir_flags(comb, tiempo_limite), archivo_stats)
+        _fijar_nucleo(proceso.pid, nucleos[indice % len(nucleos)])
+        threading.Thread(target=_esperar_cadical, args=(indice, proceso, archivo_stats, respuestas),
+                         daemon=True).start()
+        procesos.append(proceso)
+    return procesos
+
+
+def _stats_cadical(codigo, stats):
+    return stats
+
+
+# ====================================================
+#                  MOTOR PYTHON
+# ====================================================
+
+class _TiempoAgotado(Exception):
+    pass
+
+
+def _agotar_tiempo(signum, frame):
+    raise _TiempoAgotado()
+
+
+def _resolver_python(indice, path_cnf, comb, respuestas, tiempo_limite):
+    """
+    Cuerpo de cada proceso del motor Python: resuelve con la variante de la combinación.
+    Al agotar tiempo_limite responde con el código 0, como CaDiCaL con -t; cualquier
+    fallo, también al importar el solver, responde con el código 1.
+    """
+    if hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _agotar_tiempo)
+        signal.setitimer(signal.ITIMER_REAL, tiempo_limite)
+    try:
+        sys.path.insert(0, DIR_SOLVERS_PYTHON)
+        from dimacs import load_dimacs
+        from restart_policy import LubyRestart
+        if comb["dlis"]:
+            from dpll_cdcl_dlis_sat_solver import SATSolver
+        elif comb["vsids"]:
+            from dpll_cdcl_vsids_sat_solver import SATSolver
+        else:
+            from dpll_cdcl_sat_solver import SATSolver
+        solver = SATSolver(load_dimacs(path_cnf), restart_policy=LubyRestart() if comb["restart"] else None)
+        modelo = solver.solve()
+        respuestas.put((indice, 10 if modelo is not None else 20, ""))
+    except _TiempoAgotado:
+        respuestas.put((indice, 0, ""))
+    except Exception as e:
+        respuestas.put((indice, 1, str(e)))
+
+
+def _lanzar_python(path_cnf, combinaciones, nucleos, respuestas, tiempo_limite):
+    procesos = []
+    for indice, comb in enumerate(combinaciones):
+        proceso = multiprocessing.Process(target=_resolver_python,
+                                          args=(indice, path_cnf, comb, respuestas, tiempo_limite), daemon=True)
+        proceso.start()
+        _fijar_nucleo(proceso.pid, nucleos[indice % len(nucleos)])
+        procesos.append(proceso)
+    return procesos
+
+
+def _stats_python(codigo, salida):
+    stats = {"resultado": {10: "SATISFIABLE", 20: "UNSATISFIABLE", 0: "TIMEOUT"}.get(codigo, "ERROR")}
+    if salida:
+        stats["error"] = salida
+    return stats
+
+
+MOTORES = {
+    "cadical": (_lanzar_cadical, _stats_cadical),
+    "python": (_lanzar_python, _stats_python),
+}
+
+
+# ====================================================
+#                  PORTAFOLIO
+# ====================================================
+
+def resolver_portafolio(path_cnf, combinaciones=COMBINACIONES, motor="cadical", nucleos=None,
+                        tiempo_limite=TIEMPO_LIMITE):
+    """
+    Lanza todas las combinaciones sobre la instancia y devuelve las estadísticas del primer
+    veredicto (SAT o UNSAT), con la combinación ganadora en 'comb'. Los demás procesos se
+    matan en cuanto hay veredicto.
+
+    Si ninguna combinación responde a tiempo, el resultado es TIMEOUT (o ERROR si todas
+    fallaron) y 'comb' es None.
+    """
+    lanzar, extraer_stats = MOTORES[motor]
+    nucleos = nucleos or nucleos_fisicos()
+    respuestas = multiprocessing.Queue() if motor == "python" else queue.Queue()
+    inicio = time.time()
+    procesos = lanzar(path_cnf, combinaciones, nucleos, respuestas, tiempo_limite)
+    stats = None
+    errores = 0
+    try:
+        for _ in combinaciones:
+            restante = tiempo_limite - (time.time() - inicio)
+            if restante <= 0:
+                break
+            try:
+                indice, codigo, salida = respuestas.get(timeout=restante)
+            except queue.Empty:
+                break
+            stats_proceso = extraer_stats(codigo, salida)
+            if stats_proceso["resultado"] in VEREDICTOS:
+                stats = {**stats_proceso, "comb": combinaciones[indice]}
+                break
+            errores += stats_proceso["resultado"] == "ERROR"
+    finally:
+        for proceso in procesos:
+            proceso.kill()
+    if stats is None:
+        stats = {"resultado": "ERROR" if errores == len(combinaciones) else "TIMEOUT", "comb": None}
+    stats["tiempo_segundos"] = time.time() - inicio
+    return stats
+
+
+def registrar_ganador(path_cnf, motor, stats, path=GANADORES):
+    """Anota en la bitácora de ganadores la combinación que resolvió la instancia."""
+    comb = stats["comb"]
+    entrada = {
+        "hash": hash_instancia(path_cnf),
+        "nombre_cnf": os.path.basename(path_cnf),
+        "motor": motor,
+        "vsids": comb["vsids"],
+        "dlis": comb["dlis"],
+        "restart": comb["restart"],
+        "resultado": stats["resultado"],
+        "tiempo_segundos": stats["tiempo_segundos"],
+    }
+    with open(path, 'a') as f:
+        f.write(json.dumps(entrada) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def cargar_ganadores(path=GANADORES):
+    """Devuelve las entradas de la bitácora de ganadores, en orden de registro."""
+    ganadores = []
+    if not os.path.exists(path):
+        return ganadores
+    with open(path, 'r') as f:
+        for linea in f:
+            try:
+                ganadores.append(json.loads(linea))
+            except json.JSONDecodeError:
+                continue  # Última línea truncada por una caída
+    return ganadores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resuelve instancias CNF en modo portafolio.")
+    parser.add_argument("archivos", nargs="*",
+                        help=f"Instancias CNF (por defecto, todas las de '{INPUT_DIR}').")
+    parser.add_argument("--motor", choices=sorted(MOTORES), default="cadical",
+                        help="CaDiCaL con los flags de cada combinación o los solvers Python.")
+    args = parser.parse_args()
+
+    archivos = args.archivos
+    if not archivos:
+        if not os.path.exists(INPUT_DIR):
+            print(f"Error: Carpeta '{INPUT_DIR}' no encontrada.")
+            return
+        archivos = [os.path.join(INPUT_DIR, f) for f in sorted(os.listdir(INPUT_DIR))
+                    if f.endswith(EXTENSIONES_CNF)]
+
+    for path_cnf in archivos:
+        stats = resolver_portafolio(path_cnf, motor=args.motor)
+        comb = stats["comb"]
+        if comb is None:
+            print(f"{path_cnf}: {stats['resultado']} ({stats['tiempo_segundos']:.2f} s)")
+            continue
+        print(f"{path_cnf}: {stats['resultado']} en {stats['tiempo_segundos']:.2f} s "
+              f"con VSIDS={comb['vsids']} DLIS={comb['dlis']} RESTART={comb['restart']}")
+        registrar_ganador(path_cnf, args.motor, stats)
+
+
+if __name__ == "__main__":
+    main()
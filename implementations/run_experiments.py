@@ -2,20 +2,55 @@
 Script para ejecutar pruebas con CaDiCaL 2.1.3 sobre instancias CNF usando distintas heurísticas.
 
 Requisitos:
-- Tener CaDiCaL 2.1.3 instalado y accesible desde el PATH como 'cadical'.
+- Tener compilado el CaDiCaL 2.1.3 modificado de './cadical' (con DLIS y la opción
+  '-j <fd>', que escribe las estadísticas como un objeto JSON en un descriptor aparte).
 - Colocar las instancias CNF en la carpeta './problemas_sat/'.
-- Ejecutar con: python3 experimento_cadical.py
-
-El resultado se guarda en 'resultados_experimento.csv'.
-El análisis estadístico posterior se realiza por separado (p. ej., en pandas o R).
+- Ejecutar con: python3 run_experiments.py [--campana NOMBRE] [--jobs N] [--racing [--eta E] [--rondas R]]
+
+Con --jobs N se ejecutan hasta N procesos de CaDiCaL a la vez, cada uno fijado a
+su propio núcleo (por defecto, y como máximo, uno por núcleo físico). Las tareas se toman de una
+cola común ordenada de la más costosa a la más barata.
+
+Cada celda terminada (instancia × combinación con veredicto o TIMEOUT) se anota en la
+bitácora de su campaña ('_bitacora.jsonl' dentro de la partición de la campaña) una
+vez que su fila está en disco. Al relanzar una campaña interrumpida (con el mismo
+--campana) se omiten las celdas ya anotadas y solo se ejecutan las que faltan o no
+terminaron (ERROR, CaDiCaL caído); al leer el almacén, de cada celda queda su última
+fila.
+
+Con --racing cada instancia se resuelve por rondas (successive halving): primero
+todas las combinaciones con un presupuesto corto (TIEMPO_LIMITE / E^(R-1), en segundos
+enteros); si alguna responde, las que no respondieron quedan eliminadas; si ninguna
+responde, se repiten todas con un presupuesto E veces mayor, hasta TIEMPO_LIMITE. Las
+combinaciones sin esperanza no gastan el límite completo y el orden entre las de cada
+instancia se conserva en su PAR-2.
+
+Cada fila registra el límite de tiempo de su ejecución ('tiempo_limite') y su tiempo
+PAR-2 ('par2'): el tiempo real si hubo veredicto y el doble del límite si no.
+
+CaDiCaL corre en silencio y sin imprimir el modelo: las estadísticas de cada ejecución
+se leen del registro JSON y no de su salida estándar.
+
+Los resultados se guardan por lotes en el almacén Parquet 'resultados_experimento/',
+con una partición por campaña y un esquema fijo (ver almacen_resultados.py). El
+análisis estadístico posterior se realiza por separado (p. ej., en pandas o R); el
+notebook los lee con almacen_resultados.cargar_resultados.
+
+Para resolver instancias lo antes posible en lugar de medir cada combinación por
+separado, ver el modo portafolio en portafolio.py.
 """
 
 import os
 import subprocess
-import csv
 import time
-import re
-from collections import Counter
+import argparse
+import queue
+import json
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from almacen_resultados import DIRECTORIO_RESULTADOS, EscritorResultados, compactar_campana, directorio_campana
+from caracteristicas_cnf import directorio_cache, hash_instancia, obtener_caracteristicas
 
 # ====================================================
 #         CONFIGURACIÓN DE FLAGS DE CADICAL
@@ -25,13 +60,20 @@ FLAG_DLIS_TRUE = "--dlis=true --score=false"
 FLAG_DLIS_FALSE = "--dlis=false"
 FLAG_RESTART = "--restart=true"
 FLAG_NO_RESTART = "--restart=false"
-FLAG_STATS = "--stats"
-FLAG_TIME = "-t 120"
+FLAG_QUIET = "-q"
+FLAG_NO_WITNESS = "-n"  # No imprimir el modelo
+FLAG_STATS_JSON = "-j"  # Descriptor donde escribir las estadísticas en JSON
+FLAG_TIME = "-t"
 CADICAL_EXECUTABLE = "./cadical/build/cadical"  # Ajusta la ruta si es necesario
 # ====================================================
 
+TIEMPO_LIMITE = 120  # segundos por ejecución
+MARGEN_TIMEOUT = 5   # segundos de gracia sobre el -t de CaDiCaL antes de matarlo
+
 INPUT_DIR = "./generated_benchmarks"
-OUTPUT_CSV = "resultados_experimento.csv"
+EXTENSIONES_CNF = ('.cnf', '.cnf.gz', '.cnf.xz', '.cnf.bz2')
+CAMPANA = "principal"
+BITACORA = "_bitacora.jsonl"  # Dentro de la partición de la campaña
 
 COMBINACIONES = [
     {"vsids": 1, "dlis": 0, "restart": 1},
@@ -40,53 +82,16 @@ COMBINACIONES = [
     {"vsids": 0, "dlis": 1, "restart": 0},
 ]
 
-def extraer_caracteristicas_cnf(path):
-    with open(path, 'r') as f:
-        lineas = f.readlines()
-
-    num_vars = num_clausulas = 0
-    clausulas = []
-    literal_counter = Counter()
-
-    for linea in lineas:
-        linea = linea.strip()
-        if linea.startswith('c') or linea == '':
-            continue
-        if linea.startswith('p'):
-            partes = linea.split()
-            if len(partes) >= 4:
-                num_vars = int(partes[2])
-                num_clausulas = int(partes[3])
-            continue
-
-        literales = list(map(int, linea.split()))
-        if literales and literales[-1] == 0:
-            literales.pop()
-        clausulas.append(literales)
-        for lit in literales:
-            literal_counter[lit] += 1
-
-    densidad = num_clausulas / num_vars if num_vars else 0
-    tamanio_prom_clausula = sum(len(c) for c in clausulas) / len(clausulas) if clausulas else 0
-    dist_lit = Counter(len(c) for c in clausulas)
-    dist_longitudes = {f"clausulas_len_{k}": dist_lit[k] / num_clausulas for k in dist_lit}
-
-    positivos = sum(1 for l in literal_counter if l > 0)
-    negativos = sum(1 for l in literal_counter if l < 0)
+VEREDICTOS = ("SATISFIABLE", "UNSATISFIABLE")
 
-    return {
-        "num_vars": num_vars,
-        "num_clausulas": num_clausulas,
-        "densidad": densidad,
-        "tamanio_prom_clausula": tamanio_prom_clausula,
-        "vars_positivas": positivos,
-        "vars_negativas": negativos,
-        **dist_longitudes
-    }
+# Resultados de una ejecución completa, que se anotan en la bitácora
+TERMINADAS = VEREDICTOS + ("TIMEOUT",)
 
-def construir_flags(comb):
-    flags = [FLAG_STATS]
-    flags += FLAG_TIME.split()
+def construir_flags(comb, tiempo_limite=TIEMPO_LIMITE, modelo=False):
+    flags = [FLAG_QUIET]
+    if not modelo:
+        flags.append(FLAG_NO_WITNESS)
+    flags += [FLAG_TIME, str(max(1, int(tiempo_limite)))]
 
     if comb["vsids"]:
         flags += FLAG_VSIDS.split()
@@ -95,88 +100,89 @@ def construir_flags(comb):
     flags += (FLAG_RESTART if comb["restart"] else FLAG_NO_RESTART).split()
     return flags
 
-import re
-
-def parsear_stats(salida, exit_code):
-    stats = {}
-
-    # Mapear el código de salida a un resultado textual
-    codigos_resultado = {
-        10: "SATISFIABLE",
-        20: "UNSATISFIABLE",
-        0: "FINALIZACION_OK",
-        1: "ERROR"
-    }
-
-    # Añadir el resultado al diccionario
-    stats['resultado'] = codigos_resultado.get(exit_code, f"DESCONOCIDO_{exit_code}")
-
-    # Parsear las estadísticas del texto
-    for linea in salida.splitlines():
-        if not linea.startswith("c "):
-            continue
-        m = re.match(r"c\s+([^:]+):\s+([^\s]+)", linea)
-        if m:
-            clave = m.group(1).strip().lower().replace(" ", "_").replace("/", "_por_")
-            valor = m.group(2)
-            try:
-                if '.' in valor or 'e' in valor.lower():
-                    valor = float(valor)
-                else:
-                    valor = int(valor)
-                stats[clave] = valor
-            except ValueError:
-                continue
-    
-    # print(f"{stats['resultado']}!!!!!!!!!!!!!!!!!!!!!!")
-    # print(f"{codigos_resultado.get(exit_code, f"DESCONOCIDO_{exit_code}")}")
 
+CODIGOS_RESULTADO = {
+    10: "SATISFIABLE",
+    20: "UNSATISFIABLE",
+    0: "TIMEOUT",  # CaDiCaL sale con 0 cuando se le acaba el límite de -t sin veredicto
+    1: "ERROR"
+}
+
+
+def lanzar_cadical(path_cnf, flags, archivo_stats):
+    """
+    Lanza CaDiCaL sobre la instancia con las estadísticas dirigidas a archivo_stats
+    (un archivo temporal abierto). La salida estándar se descarta: con los flags de
+    construir_flags solo trae la línea 's ...' de estado.
+    """
+    descriptor = archivo_stats.fileno()
+    return subprocess.Popen(
+        [CADICAL_EXECUTABLE] + flags + [FLAG_STATS_JSON, str(descriptor), path_cnf],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        pass_fds=(descriptor,)
+    )
+
+
+def leer_stats(archivo_stats, exit_code):
+    """
+    Estadísticas de una ejecución a partir de su registro JSON y su código de salida.
+
+    Los nombres de las estadísticas son los de las líneas 'c nombre: valor' de
+    '--stats' (en minúsculas y con '_' en lugar de espacios), y están siempre todas;
+    las subestadísticas con el nombre de otra línea llevan delante el de su sección
+    (p. ej. 'restored_literals'). Con FLAG_NO_WITNESS no se extiende el modelo, así
+    que 'extensions' y 'flipped' quedan en 0.
+    Si CaDiCaL terminó sin escribir el registro, solo queda el resultado.
+    """
+    archivo_stats.seek(0)
+    try:
+        stats = json.load(archivo_stats)
+    except json.JSONDecodeError:
+        stats = {}
+    stats.pop("version", None)
+    stats["resultado"] = CODIGOS_RESULTADO.get(exit_code, f"DESCONOCIDO_{exit_code}")
     return stats
 
-def detectar_resultado_solver(exit_code):
-    if exit_code == 10:
-        return "SAT"
-    elif exit_code == 20:
-        return "UNSAT"
-    elif exit_code == 0:
-        return "OK"
-    elif exit_code == 1:
-        return "ERROR"
-    else:
-        return "unknown"
 
-    
-def limpiar_output_modelo(salida):
-    """Elimina las líneas del modelo SAT (que empiezan con 'v ')"""
-    return "\n".join(linea for linea in salida.splitlines() if not linea.startswith("v "))
+def par2(resultado, tiempo, tiempo_limite=TIEMPO_LIMITE):
+    """Tiempo penalizado PAR-2: una ejecución sin veredicto cuenta el doble de su límite."""
+    return tiempo if resultado in VEREDICTOS else 2 * tiempo_limite
 
 
-def ejecutar_solver(path_cnf, flags):
+def ejecutar_solver(path_cnf, flags, nucleo=None, tiempo_limite=TIEMPO_LIMITE):
     try:
         inicio = time.time()
-        resultado = subprocess.run(
-            [CADICAL_EXECUTABLE] + flags + [path_cnf],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            timeout=120,
-            text=True
-        )
-        duracion = time.time() - inicio
-        salida = resultado.stdout + resultado.stderr
-
-        # 🧹 Eliminar modelo SAT del output
-        salida = limpiar_output_modelo(salida)
-
-        # ✅ Pasar también el código de salida
-        stats = parsear_stats(salida, resultado.returncode)
+        with tempfile.TemporaryFile(mode='w+') as archivo_stats:
+            proceso = lanzar_cadical(path_cnf, flags, archivo_stats)
+            # 📌 Fijar el proceso a su núcleo para que las ejecuciones no compitan entre sí
+            if nucleo is not None and hasattr(os, "sched_setaffinity"):
+                try:
+                    os.sched_setaffinity(proceso.pid, {nucleo})
+                except OSError:
+                    pass
+            try:
+                proceso.communicate(timeout=tiempo_limite + MARGEN_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                proceso.kill()
+                proceso.communicate()
+                raise
+            duracion = time.time() - inicio
+
+            # ✅ Estadísticas del registro JSON, con el código de salida
+            stats = leer_stats(archivo_stats, proceso.returncode)
+        stats['tiempo_limite'] = tiempo_limite
+        stats['par2'] = par2(stats['resultado'], duracion, tiempo_limite)
         stats['tiempo_segundos'] = duracion
-        #stats['resultado'] = detectar_resultado_solver(resultado.returncode)
         return stats
 
     except subprocess.TimeoutExpired:
         print(f"⚠️ Timeout: {path_cnf} con flags {flags}")
         return {
-            "tiempo_segundos": 60,
+            "tiempo_limite": tiempo_limite,
+            "par2": par2("TIMEOUT", tiempo_limite, tiempo_limite),
+            "tiempo_segundos": time.time() - inicio,
             "resultado": "TIMEOUT"
         }
     except Exception as e:
@@ -188,46 +194,261 @@ def ejecutar_solver(path_cnf, flags):
         }
 
 
+def nucleos_fisicos():
+    """
+    Devuelve un CPU lógico por cada núcleo físico disponible para este proceso.
+    Si la topología no está disponible (p. ej., fuera de Linux) se usan todos los CPUs.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        disponibles = sorted(os.sched_getaffinity(0))
+    else:
+        disponibles = list(range(os.cpu_count() or 1))
+
+    vistos = set()
+    nucleos = []
+    for cpu in disponibles:
+        base = f"/sys/devices/system/cpu/cpu{cpu}/topology"
+        try:
+            with open(os.path.join(base, "physical_package_id")) as f:
+                paquete = f.read().strip()
+            with open(os.path.join(base, "core_id")) as f:
+                nucleo = f.read().strip()
+        except OSError:
+            return disponibles
+        if (paquete, nucleo) not in vistos:
+            vistos.add((paquete, nucleo))
+            nucleos.append(cpu)
+    return nucleos or disponibles
+
+
+def costo_estimado(caracteristicas):
+    """Estimación del costo de una instancia: número total de literales de la fórmula."""
+    return caracteristicas["num_clausulas"] * caracteristicas["tamanio_prom_clausula"]
+
+
+def construir_fila(archivo, hash_cnf, comb, caracteristicas, stats):
+    return {
+        "nombre_cnf": archivo,
+        "hash_cnf": hash_cnf,
+        "vsids": comb["vsids"],
+        "dlis": comb["dlis"],
+        "restart": comb["restart"],
+        "resultado": stats.get("resultado", "UNKNOWN"),
+        **caracteristicas,
+        **{k: v for k, v in stats.items() if k not in {"resultado", "timeout", "error"}}
+
+    }
+
+
+def clave_celda(hash_cnf, comb):
+    return f"{hash_cnf}:{comb['vsids']}{comb['dlis']}{comb['restart']}"
+
+
+def path_bitacora(campana, directorio=DIRECTORIO_RESULTADOS):
+    return os.path.join(directorio_campana(campana, directorio), BITACORA)
+
+
+def cargar_celdas_completadas(path):
+    """Lee la bitácora y devuelve las claves de las celdas ya terminadas."""
+    completadas = set()
+    if not os.path.exists(path):
+        return completadas
+    with open(path, 'r') as f:
+        for linea in f:
+            try:
+                entrada = json.loads(linea)
+            except json.JSONDecodeError:
+                # Última línea truncada por una caída: esa celda se vuelve a ejecutar
+                continue
+            completadas.add(entrada["clave"])
+    return completadas
+
+
+def registrar_celdas(bitacora, celdas):
+    """Anota las celdas (clave, fila) terminadas; se llama después de que sus filas están en disco."""
+    for clave, fila in celdas:
+        entrada = {
+            "clave": clave,
+            "nombre_cnf": fila["nombre_cnf"],
+            "vsids": fila["vsids"],
+            "dlis": fila["dlis"],
+            "restart": fila["restart"],
+            "resultado": fila["resultado"],
+        }
+        bitacora.write(json.dumps(entrada) + "\n")
+    bitacora.flush()
+    os.fsync(bitacora.fileno())
+
+
+def ejecutar_tarea(tarea, tiempo_limite, nucleos_libres):
+    """Toma un núcleo libre, ejecuta CaDiCaL fijado a él y lo devuelve al terminar."""
+    archivo, path_cnf, comb, caracteristicas, hash_cnf = tarea
+    flags = construir_flags(comb, tiempo_limite)
+    nucleo = nucleos_libres.get()
+    try:
+        print(f"Procesando {archivo} con VSIDS={comb['vsids']} DLIS={comb['dlis']} RESTART={comb['restart']} "
+              f"(límite {tiempo_limite:g} s, núcleo {nucleo})...")
+        stats = ejecutar_solver(path_cnf, flags, nucleo, tiempo_limite)
+    finally:
+        nucleos_libres.put(nucleo)
+    return construir_fila(archivo, hash_cnf, comb, caracteristicas, stats)
+
+
+def presupuestos_carrera(eta, rondas):
+    """
+    Límites de tiempo de las rondas de la carrera: crecen por un factor eta hasta TIEMPO_LIMITE.
+    Se redondean a segundos enteros, que es lo que acepta el -t de CaDiCaL, y las rondas
+    que quedan con el mismo límite se funden en una.
+    """
+    return sorted({max(1, round(TIEMPO_LIMITE / eta ** (rondas - 1 - ronda))) for ronda in range(rondas)})
+
+
+def ejecutar_carrera(tareas, presupuestos, jobs, nucleos, escritor):
+    """
+    Ejecuta las tareas por rondas con los límites de 'presupuestos' y escribe cada fila
+    cuando es definitiva: al responder (o fallar) la combinación, al ser eliminada porque
+    otra combinación de su instancia respondió en la misma ronda, o en la última ronda.
+    Las que no responden en una ronda en la que nadie respondió se repiten en la siguiente.
+
+    Con un único presupuesto es la ejecución normal de la campaña.
+
+    Devuelve las filas escritas.
+    """
+    nucleos_libres = queue.Queue()
+    for nucleo in nucleos[:jobs]:
+        nucleos_libres.put(nucleo)
+
+    en_curso = {}       # archivo -> tareas de la ronda actual sin terminar
+    sin_veredicto = {}  # archivo -> (tarea, fila) de la ronda actual que esperan la decisión
+    resuelta = {}       # archivo -> alguna combinación respondió en la ronda actual
+    escritas = []
+
+    def anotar(tarea, fila):
+        escritas.append(fila)
+        # Las celdas sin terminar (ERROR, CaDiCaL caído) no se anotan para que se repitan al reanudar
+        escritor.agregar(fila, clave_celda(tarea[4], tarea[2]) if fila["resultado"] in TERMINADAS else None)
+
+    # Un único escritor (este hilo) de los resultados
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futuros = {}
+
+        def lanzar_ronda(tareas_ronda, ronda):
+            for tarea in tareas_ronda:
+                archivo = tarea[0]
+                en_curso[archivo] = en_curso.get(archivo, 0) + 1
+                sin_veredicto.setdefault(archivo, [])
+                resuelta.setdefault(archivo, False)
+                futuro = pool.submit(ejecutar_tarea, tarea, presupuestos[ronda], nucleos_libres)
+                futuros[futuro] = (tarea, ronda)
+
+        lanzar_ronda(tareas, 0)
+        while futuros:
+            hechos, _ = wait(futuros, return_when=FIRST_COMPLETED)
+            for futuro in hechos:
+                tarea, ronda = futuros.pop(futuro)
+                archivo = tarea[0]
+                fila = futuro.result()
+                en_curso[archivo] -= 1
+                if fila["resultado"] in VEREDICTOS:
+                    resuelta[archivo] = True
+                # Las que no terminaron (ERROR, CaDiCaL caído) no se repiten con más tiempo
+                if fila["resultado"] in VEREDICTOS or fila["resultado"] not in TERMINADAS or ronda + 1 == len(presupuestos):
+                    anotar(tarea, fila)
+                else:
+                    sin_veredicto[archivo].append((tarea, fila))
+                if en_curso[archivo]:
+                    continue
+
+                # Ronda de la instancia terminada
+                pendientes = sin_veredicto.pop(archivo)
+                if resuelta.pop(archivo):
+                    # Eliminadas: otra combinación respondió dentro del mismo límite
+                    for tarea_pendiente, fila_pendiente in pendientes:
+                        anotar(tarea_pendiente, fila_pendiente)
+                elif pendientes:
+                    lanzar_ronda([tarea_pendiente for tarea_pendiente, _ in pendientes], ronda + 1)
+    return escritas
+
+
+def resumen_par2(filas):
+    """PAR-2 medio por combinación de las filas escritas."""
+    por_comb = {}
+    for fila in filas:
+        clave = (fila["vsids"], fila["dlis"], fila["restart"])
+        por_comb.setdefault(clave, []).append(fila.get("par2", 2 * TIEMPO_LIMITE))
+    return {clave: sum(valores) / len(valores) for clave, valores in sorted(por_comb.items())}
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Experimentos con CaDiCaL sobre instancias CNF.")
+    parser.add_argument("--campana", default=CAMPANA,
+                        help=f"Campaña (partición del almacén) donde se guardan los resultados (por defecto, '{CAMPANA}').")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Número de procesos de CaDiCaL simultáneos (por defecto, núcleos físicos).")
+    parser.add_argument("--racing", action="store_true",
+                        help="Resolver cada instancia por rondas con límites crecientes (successive halving).")
+    parser.add_argument("--eta", type=float, default=4,
+                        help="Factor de crecimiento del límite entre rondas (con --racing).")
+    parser.add_argument("--rondas", type=int, default=3,
+                        help="Número de rondas; la última usa TIEMPO_LIMITE (con --racing).")
+    args = parser.parse_args()
+
     if not os.path.exists(INPUT_DIR):
         print(f"Error: Carpeta '{INPUT_DIR}' no encontrada.")
         return
 
-    archivos_cnf = [f for f in os.listdir(INPUT_DIR) if f.endswith('.cnf')]
+    archivos_cnf = [f for f in os.listdir(INPUT_DIR) if f.endswith(EXTENSIONES_CNF)]
     if not archivos_cnf:
         print("No se encontraron archivos .cnf en la carpeta de entrada.")
         return
 
-
+    nucleos = nucleos_fisicos()
+    jobs = max(1, args.jobs if args.jobs else len(nucleos))
+    if jobs > len(nucleos):
+        # Dos procesos en un mismo núcleo se reparten su tiempo y falsean las mediciones
+        print(f"⚠️ --jobs {jobs} supera los {len(nucleos)} núcleos físicos disponibles; se usan {len(nucleos)}.")
+        jobs = len(nucleos)
+
+    bitacora_campana = path_bitacora(args.campana)
+    completadas = cargar_celdas_completadas(bitacora_campana)
+    pendientes = {}
+    hashes = {}
     for archivo in archivos_cnf:
         path_cnf = os.path.join(INPUT_DIR, archivo)
-        caracteristicas = extraer_caracteristicas_cnf(path_cnf)
-
-        for comb in COMBINACIONES:
-            flags = construir_flags(comb)
-            print(f"Procesando {archivo} con VSIDS={comb['vsids']} DLIS={comb['dlis']} RESTART={comb['restart']}...")
-            stats = ejecutar_solver(path_cnf, flags)
-
-            fila = {
-                "nombre_cnf": archivo,
-                "vsids": comb["vsids"],
-                "dlis": comb["dlis"],
-                "restart": comb["restart"],
-                "resultado": stats.get("resultado", "UNKNOWN"),
-                **caracteristicas,
-                **{k: v for k, v in stats.items() if k not in {"resultado", "timeout", "error"}}
-
-            }
-            with open(OUTPUT_CSV, 'a', newline='') as csvfile:
-                columnas = list(fila.keys())
-                writer = csv.DictWriter(csvfile, fieldnames=columnas)
-                writer.writeheader()
-                # Rellenar valores faltantes con None
-                fila_filtrada = {col: fila.get(col, None) for col in writer.fieldnames}
-                writer.writerow(fila_filtrada)
-
-            #fila_filtrada = {k: fila[k] for k in writer.fieldnames}
+        hash_cnf = hash_instancia(path_cnf)
+        combs = [comb for comb in COMBINACIONES
+                 if clave_celda(hash_cnf, comb) not in completadas]
+        if combs:
+            pendientes[archivo] = combs
+            hashes[path_cnf] = hash_cnf
+
+    # Las características salen de la caché; solo se calculan las instancias nuevas
+    caracteristicas = obtener_caracteristicas(hashes, directorio_cache(INPUT_DIR), jobs)
+
+    tareas = []
+    for archivo, combs in pendientes.items():
+        path_cnf = os.path.join(INPUT_DIR, archivo)
+        for comb in combs:
+            tareas.append((archivo, path_cnf, comb, caracteristicas[path_cnf], hashes[path_cnf]))
+
+    omitidas = len(archivos_cnf) * len(COMBINACIONES) - len(tareas)
+    if omitidas:
+        print(f"↩️ Reanudando: {omitidas} celdas ya completadas según '{bitacora_campana}'.")
+
+    # Cola común: primero las instancias más costosas para no dejar la más larga al final
+    tareas.sort(key=lambda t: costo_estimado(t[3]), reverse=True)
+
+    presupuestos = presupuestos_carrera(args.eta, args.rondas) if args.racing else [TIEMPO_LIMITE]
+    inicio = time.time()
+    os.makedirs(os.path.dirname(bitacora_campana), exist_ok=True)
+    with open(bitacora_campana, 'a') as bitacora, \
+            EscritorResultados(args.campana, al_guardar=lambda celdas: registrar_celdas(bitacora, celdas)) as escritor:
+        filas = ejecutar_carrera(tareas, presupuestos, jobs, nucleos, escritor)
+    compactar_campana(args.campana)
+
+    print(f"⏱️ Campaña terminada en {time.time() - inicio:.1f} s. PAR-2 medio por combinación:")
+    for (vsids, dlis, restart), valor in resumen_par2(filas).items():
+        print(f"   VSIDS={vsids} DLIS={dlis} RESTART={restart}: {valor:.2f} s")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,313 @@
+"""
+Selección de algoritmo: predice, a partir de las características de un CNF, qué
+combinación de heurísticas de CaDiCaL será la más rápida, para ejecutar solo esa
+(un núcleo por instancia) en lugar de las cuatro.
+
+Entrenamiento (python3 seleccion_configuracion.py entrenar [--campana NOMBRE ...]):
+- Se leen los resultados del almacén 'resultados_experimento/' (todas las campañas
+  o las indicadas) y se construye, por instancia, el tiempo PAR-2 de cada
+  combinación (los TIMEOUT y errores cuentan como 2 × su límite de tiempo), con
+  la fila de mayor límite de tiempo si hay varias.
+  Las características que falten en el almacén (las filas importadas del CSV
+  histórico solo tienen las básicas) se toman de las instancias de INPUT_DIR,
+  con la caché de características de run_experiments.py.
+- Se añaden las instancias que resolvió el modo portafolio (GANADORES, motor
+  cadical): la combinación ganadora con su tiempo y las demás, cortadas en ese
+  momento, con el doble de ese tiempo, como un TIMEOUT en PAR-2.
+- Un RandomForestRegressor multisalida aprende log(1 + PAR-2) de las cuatro
+  combinaciones a partir de log(1 + características): todas las del extractor
+  (grados del VIG y del CVIG, polaridad, cláusulas Horn...) y la distribución de
+  longitudes de cláusula.
+- Con validación cruzada sobre las instancias de los experimentos (las del
+  portafolio solo se usan para entrenar) se estima la ganancia media frente a la
+  mejor combinación única (la de menor PAR-2 medio).
+- Se mide el costo de extraer las características (segundos por byte) sobre las
+  instancias de INPUT_DIR.
+Todo se guarda con joblib en 'selector_configuracion.joblib'.
+
+Uso: select_configuration(path_cnf) devuelve la combinación elegida y sus flags,
+con el límite de tiempo descontando lo gastado en extraer las características. Si
+la extracción estimada cuesta más que la ganancia media del selector, no se
+extrae nada y se devuelve la mejor combinación única.
+"""
+
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import KFold
+
+from almacen_resultados import CARACTERISTICAS, DIRECTORIO_RESULTADOS, LONGITUDES, PREFIJO_LONGITUDES, cargar_resultados
+from caracteristicas_cnf import (cargar_cache_caracteristicas, directorio_cache, extraer_caracteristicas_numpy,
+                                 hash_instancia, obtener_caracteristicas)
+from portafolio import GANADORES, cargar_ganadores
+from run_experiments import COMBINACIONES, EXTENSIONES_CNF, INPUT_DIR, TIEMPO_LIMITE, construir_flags, par2
+
+MODELO_SELECTOR = "selector_configuracion.joblib"
+
+# Incrementar al cambiar las características o el formato del modelo guardado
+VERSION_SELECTOR = 2
+
+# Características usadas por el modelo: todas las del extractor y la fracción de
+# cláusulas de cada longitud, con las de LONGITUD_MAXIMA o más literales juntas
+CARACTERISTICAS_EXTRACTOR = [nombre for nombre, _ in CARACTERISTICAS]
+LONGITUD_MAXIMA = 6
+CARACTERISTICAS_MODELO = (CARACTERISTICAS_EXTRACTOR
+                          + [f"{PREFIJO_LONGITUDES}{k}" for k in range(1, LONGITUD_MAXIMA)]
+                          + [f"{PREFIJO_LONGITUDES}{LONGITUD_MAXIMA}+"])
+
+# Segundos por byte si no hay instancias con las que medir la extracción
+SEGUNDOS_POR_BYTE_DEFECTO = 2e-7
+
+_modelos_cargados = {}
+
+
+def clave_comb(comb):
+    return (comb["vsids"], comb["dlis"], comb["restart"])
+
+
+def _fracciones_longitud(longitudes):
+    """{longitud: fracción de cláusulas} -> fracciones por longitud de CARACTERISTICAS_MODELO."""
+    fracciones = [0.0] * LONGITUD_MAXIMA
+    for longitud, fraccion in longitudes:
+        fracciones[min(max(int(longitud), 1), LONGITUD_MAXIMA) - 1] += fraccion
+    return fracciones
+
+
+def lista_caracteristicas(caracteristicas):
+    """Características del extractor ('clausulas_len_<k>' incluidas) -> lista en el orden del modelo."""
+    longitudes = [(clave[len(PREFIJO_LONGITUDES):], valor) for clave, valor in caracteristicas.items()
+                  if clave.startswith(PREFIJO_LONGITUDES)]
+    return [float(caracteristicas[nombre]) for nombre in CARACTERISTICAS_EXTRACTOR] + _fracciones_longitud(longitudes)
+
+
+def caracteristicas_instancias(input_dir=INPUT_DIR):
+    """
+    Devuelve {nombre_cnf: (hash, características)} de las instancias de input_dir. Se
+    leen de la caché de run_experiments.py; las que faltan se calculan y se guardan.
+    """
+    if not os.path.isdir(input_dir):
+        return {}
+    hashes = {os.path.join(input_dir, nombre): None for nombre in sorted(os.listdir(input_dir))
+              if nombre.endswith(EXTENSIONES_CNF)}
+    for path in hashes:
+        hashes[path] = hash_instancia(path)
+    caracteristicas = obtener_caracteristicas(hashes, directorio_cache(input_dir))
+    return {os.path.basename(path): (hash_cnf, caracteristicas[path]) for path, hash_cnf in hashes.items()}
+
+
+def leer_resultados(directorio=DIRECTORIO_RESULTADOS, campanas=None, instancias_dir=None):
+    """
+    Devuelve {instancia: (características, {clave_comb: PAR-2})} a partir del almacén. La
+    instancia es el hash del CNF si está en instancias_dir (ver caracteristicas_instancias)
+    y si no su nombre.
+
+    Las filas sin todas las características las toman de instancias_dir por nombre; las
+    que no están allí se descartan. Las filas sin PAR-2 (errores, filas importadas del
+    CSV histórico) lo calculan con TIEMPO_LIMITE.
+
+    Si una instancia y combinación tiene filas en varias campañas, vale la de mayor límite
+    de tiempo (a igual límite, la última): las rondas cortas de una carrera o las campañas
+    de prueba no reemplazan a una ejecución con el límite completo.
+    """
+    instancias_dir = instancias_dir or {}
+    columnas = ["nombre_cnf", "vsids", "dlis", "restart", "resultado", "tiempo_segundos", "tiempo_limite", "par2"]
+    df = cargar_resultados(directorio, campanas, columnas + CARACTERISTICAS_EXTRACTOR + [LONGITUDES[0]])
+    instancias = {}
+    limites = {}  # (instancia, clave_comb) -> límite de tiempo de la fila elegida
+    for fila in df.itertuples(index=False):
+        fila = fila._asdict()
+        hash_cnf, caracteristicas_dir = instancias_dir.get(fila["nombre_cnf"], (None, None))
+        if len(fila[LONGITUDES[0]]) and all(fila[nombre] == fila[nombre] for nombre in CARACTERISTICAS_EXTRACTOR):
+            caracteristicas = ([float(fila[nombre]) for nombre in CARACTERISTICAS_EXTRACTOR]
+                               + _fracciones_longitud(fila[LONGITUDES[0]]))
+        elif caracteristicas_dir is not None:
+            caracteristicas = lista_caracteristicas(caracteristicas_dir)
+        else:
+            continue
+        comb = (int(fila["vsids"]), int(fila["dlis"]), int(fila["restart"]))
+        limite = fila["tiempo_limite"]
+        if limite != limite:  # NaN
+            limite = TIEMPO_LIMITE
+        tiempo = fila["par2"]
+        if tiempo != tiempo:
+            tiempo = par2(fila["resultado"], fila["tiempo_segundos"])
+        instancia = hash_cnf or fila["nombre_cnf"]
+        if limite >= limites.get((instancia, comb), 0):
+            limites[(instancia, comb)] = limite
+            _, tiempos = instancias.setdefault(instancia, (caracteristicas, {}))
+            tiempos[comb] = tiempo
+    return instancias
+
+
+def leer_ganadores(path_ganadores=GANADORES, dir_cache=None):
+    """
+    Devuelve {hash: (características, {clave_comb: PAR-2})} de las instancias que resolvió
+    el modo portafolio con CaDiCaL. La combinación ganadora tiene su tiempo; las demás
+    se mataron en ese momento y cuentan el doble, como un TIMEOUT en PAR-2. Si una
+    instancia se resolvió varias veces, vale la vez más rápida. Las instancias sin
+    características en la caché se descartan.
+    """
+    cache = {fila["hash"]: fila for fila in cargar_cache_caracteristicas(dir_cache or directorio_cache(INPUT_DIR))}
+    mas_rapidos = {}
+    for ganador in cargar_ganadores(path_ganadores):
+        if ganador["motor"] != "cadical" or ganador["hash"] not in cache:
+            continue
+        anterior = mas_rapidos.get(ganador["hash"])
+        if anterior is None or ganador["tiempo_segundos"] < anterior["tiempo_segundos"]:
+            mas_rapidos[ganador["hash"]] = ganador
+    instancias = {}
+    for hash_cnf, ganador in mas_rapidos.items():
+        tiempos = {clave_comb(comb): 2 * ganador["tiempo_segundos"] for comb in COMBINACIONES}
+        tiempos[clave_comb(ganador)] = ganador["tiempo_segundos"]
+        instancias[hash_cnf] = (lista_caracteristicas(cache[hash_cnf]), tiempos)
+    return instancias
+
+
+def vector_entrada(caracteristicas):
+    """Características (lista en el orden del modelo o diccionario del extractor) -> vector de entrada del modelo."""
+    if isinstance(caracteristicas, dict):
+        caracteristicas = lista_caracteristicas(caracteristicas)
+    return np.log1p(np.asarray(caracteristicas, dtype=float))
+
+
+def medir_costo_extraccion(input_dir=INPUT_DIR):
+    """Segundos por byte que cuesta extraer las características de las instancias de input_dir."""
+    if not os.path.isdir(input_dir):
+        return SEGUNDOS_POR_BYTE_DEFECTO
+    total_bytes = 0
+    total_segundos = 0.0
+    for nombre in os.listdir(input_dir):
+        if not nombre.endswith(EXTENSIONES_CNF):
+            continue
+        path = os.path.join(input_dir, nombre)
+        inicio = time.perf_counter()
+        extraer_caracteristicas_numpy(path)
+        total_segundos += time.perf_counter() - inicio
+        total_bytes += os.path.getsize(path)
+    return total_segundos / total_bytes if total_bytes else SEGUNDOS_POR_BYTE_DEFECTO
+
+
+def entrenar(directorio=DIRECTORIO_RESULTADOS, campanas=None, path_modelo=MODELO_SELECTOR, input_dir=INPUT_DIR,
+             path_ganadores=GANADORES):
+    """Entrena el selector con los resultados del almacén y del portafolio, lo guarda y devuelve su resumen."""
+    claves = [clave_comb(comb) for comb in COMBINACIONES]
+    instancias = {nombre: datos for nombre, datos in
+                  leer_resultados(directorio, campanas, caracteristicas_instancias(input_dir)).items()
+                  if all(clave in datos[1] for clave in claves)}  # Solo instancias con todas las combinaciones
+    if len(instancias) < 2:
+        raise ValueError(f"'{directorio}' no tiene suficientes instancias completas para entrenar")
+    portafolio = [datos for hash_cnf, datos in leer_ganadores(path_ganadores, directorio_cache(input_dir)).items()
+                  if hash_cnf not in instancias]
+    X = np.array([vector_entrada(caracteristicas) for caracteristicas, _ in instancias.values()])
+    tiempos = np.array([[t[clave] for clave in claves] for _, t in instancias.values()])
+    X_portafolio = np.array([vector_entrada(caracteristicas) for caracteristicas, _ in portafolio]).reshape(-1, X.shape[1])
+    y_portafolio = np.log1p(np.array([[t[clave] for clave in claves] for _, t in portafolio]).reshape(-1, len(claves)))
+    y = np.log1p(tiempos)
+
+    modelo = RandomForestRegressor(n_estimators=200, min_samples_leaf=2, random_state=0)
+    # Ganancia estimada con predicciones fuera de muestra, solo sobre las instancias de los experimentos
+    predicciones = np.empty_like(y)
+    for entrenamiento, prueba in KFold(n_splits=min(5, len(X)), shuffle=True, random_state=0).split(X):
+        modelo.fit(np.vstack([X[entrenamiento], X_portafolio]), np.vstack([y[entrenamiento], y_portafolio]))
+        predicciones[prueba] = modelo.predict(X[prueba])
+    elegidas = tiempos[np.arange(len(tiempos)), predicciones.argmin(axis=1)]
+    mejor_unica = int(tiempos.mean(axis=0).argmin())
+    resumen = {
+        "instancias": len(X),
+        "instancias_portafolio": len(portafolio),
+        "par2_mejor_unica": float(tiempos[:, mejor_unica].mean()),
+        "par2_selector": float(elegidas.mean()),
+        "par2_oraculo": float(tiempos.min(axis=1).mean()),
+    }
+    modelo.fit(np.vstack([X, X_portafolio]), np.vstack([y, y_portafolio]))
+
+    joblib.dump({
+        "version": VERSION_SELECTOR,
+        "modelo": modelo,
+        "combinaciones": COMBINACIONES,
+        "mejor_unica": mejor_unica,
+        "ganancia_media": max(0.0, resumen["par2_mejor_unica"] - resumen["par2_selector"]),
+        "segundos_por_byte": medir_costo_extraccion(input_dir),
+        "resumen": resumen,
+    }, path_modelo)
+    return resumen
+
+
+def cargar_selector(path_modelo=MODELO_SELECTOR):
+    """Carga el selector guardado (una sola vez por proceso)."""
+    selector = _modelos_cargados.get(path_modelo)
+    if selector is None:
+        selector = joblib.load(path_modelo)
+        if selector.get("version") != VERSION_SELECTOR:
+            raise ValueError(f"'{path_modelo}' es de otra versión del selector; vuelve a entrenarlo")
+        _modelos_cargados[path_modelo] = selector
+    return selector
+
+
+def select_configuration(path_cnf, presupuesto=TIEMPO_LIMITE, path_modelo=MODELO_SELECTOR):
+    """
+    Elige la combinación de heurísticas con menor tiempo predicho para la instancia.
+
+    El tiempo de extraer las características se descuenta del presupuesto. Si la
+    extracción estimada (tamaño del archivo × segundos por byte) cuesta más que la
+    ganancia media del selector o que el presupuesto, se devuelve la mejor
+    combinación única sin leer la instancia.
+
+    Devuelve un diccionario con 'comb', 'flags' (con -t ajustado al presupuesto que
+    queda), 'tiempo_extraccion', 'tiempo_predicho' (None sin características) y
+    'presupuesto_restante'.
+    """
+    selector = cargar_selector(path_modelo)
+    combinaciones = selector["combinaciones"]
+    costo_estimado = os.path.getsize(path_cnf) * selector["segundos_por_byte"]
+
+    tiempo_extraccion = 0.0
+    tiempo_predicho = None
+    elegida = selector["mejor_unica"]
+    if costo_estimado < min(selector["ganancia_media"], presupuesto):
+        inicio = time.perf_counter()
+        caracteristicas = extraer_caracteristicas_numpy(path_cnf)
+        tiempo_extraccion = time.perf_counter() - inicio
+        prediccion = selector["modelo"].predict(vector_entrada(caracteristicas).reshape(1, -1))[0]
+        elegida = int(prediccion.argmin())
+        tiempo_predicho = float(np.expm1(prediccion[elegida]))
+
+    restante = presupuesto - tiempo_extraccion
+    return {
+        "comb": combinaciones[elegida],
+        "flags": construir_flags(combinaciones[elegida], restante),
+        "tiempo_extraccion": tiempo_extraccion,
+        "tiempo_predicho": tiempo_predicho,
+        "presupuesto_restante": restante,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Selector de configuración de CaDiCaL.")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    parser_entrenar = subcomandos.add_parser("entrenar", help="Entrena el selector con el almacén de resultados.")
+    parser_entrenar.add_argument("--campana", action="append",
+                                 help="Campaña con la que entrenar (repetible; por defecto, todas).")
+    parser_elegir = subcomandos.add_parser("elegir", help="Elige la combinación para una instancia.")
+    parser_elegir.add_argument("archivo")
+    args = parser.parse_args()
+
+    if args.comando == "entrenar":
+        resumen = entrenar(campanas=args.campana)
+        print(f"✅ Selector entrenado con {resumen['instancias']} instancias de los experimentos y "
+              f"{resumen['instancias_portafolio']} del portafolio (PAR-2 medio en validación cruzada):")
+        print(f"   mejor combinación única: {resumen['par2_mejor_unica']:.2f} s")
+        print(f"   selector:                {resumen['par2_selector']:.2f} s")
+        print(f"   oráculo:                 {resumen['par2_oraculo']:.2f} s")
+    else:
+        eleccion = select_configuration(args.archivo)
+        comb = eleccion["comb"]
+        print(f"VSIDS={comb['vsids']} DLIS={comb['dlis']} RESTART={comb['restart']}: {' '.join(eleccion['flags'])}")
+
+
+if __name__ == "__main__":
+    main()
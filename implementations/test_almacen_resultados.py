@@ -0,0 +1,27 @@
+import os
+
+from almacen_resultados import cargar_resultados, importar_csv
+
+CSV_HISTORICO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados_experimento.csv")
+VEREDICTOS = ["SATISFIABLE", "UNSATISFIABLE"]
+
+
+def test_importar_csv_historico(tmp_path):
+    assert importar_csv(CSV_HISTORICO, "tesis", str(tmp_path)) == 639
+    df = cargar_resultados(str(tmp_path))
+
+    # Todas las filas resueltas conservan sus estadísticas de CaDiCaL
+    resueltas = df[df["resultado"].isin(VEREDICTOS)]
+    for estadistica in ("conflicts", "decisions", "propagations", "maximum_resident_set_size_of_process"):
+        assert resueltas[estadistica].notna().all()
+
+    # El tiempo se lee por nombre: los TIMEOUT tienen el límite de entonces, no otra columna
+    assert df["tiempo_segundos"].notna().all()
+    assert (df.loc[df["resultado"] == "TIMEOUT", "tiempo_segundos"] == 60).all()
+    # y el de los resueltos cubre el tiempo real que mide CaDiCaL (con dos decimales)
+    assert (resueltas["tiempo_segundos"] + 0.01 >= resueltas["total_real_time_since_initialization"]).all()
+
+    # Las fracciones de longitudes de cláusula importadas suman 1
+    for longitudes in df["clausulas_len"]:
+        if len(longitudes):
+            assert abs(sum(fraccion for _, fraccion in longitudes) - 1) < 1e-6